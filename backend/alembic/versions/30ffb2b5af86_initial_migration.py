@@ -17,12 +17,83 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    # Databases that were bootstrapped with Base.metadata.create_all already
+    # have these tables; only create what is missing so they can be brought
+    # under Alembic, which now manages the schema alone.
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'users' not in tables:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('google_id', sa.String(length=255), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=True),
+            sa.Column('profile_picture', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_google_id', 'users', ['google_id'], unique=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'products' not in tables:
+        op.create_table(
+            'products',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('url', sa.Text(), nullable=False),
+            sa.Column('name', sa.String(length=500), nullable=True),
+            sa.Column('current_price', sa.DECIMAL(10, 2), nullable=True),
+            sa.Column('currency', sa.String(length=10), nullable=True),
+            sa.Column('image_url', sa.Text(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('check_interval_minutes', sa.Integer(), nullable=True),
+            sa.Column('last_checked_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_products_id', 'products', ['id'])
+        op.create_index('ix_products_user_id', 'products', ['user_id'])
+        op.create_index('ix_products_is_active', 'products', ['is_active'])
+
+    if 'price_alerts' not in tables:
+        op.create_table(
+            'price_alerts',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('target_price', sa.DECIMAL(10, 2), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('triggered_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_price_alerts_id', 'price_alerts', ['id'])
+        op.create_index('ix_price_alerts_product_id', 'price_alerts', ['product_id'])
+        op.create_index('ix_price_alerts_is_active', 'price_alerts', ['is_active'])
+
+    if 'price_history' not in tables:
+        op.create_table(
+            'price_history',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('price', sa.DECIMAL(10, 2), nullable=False),
+            sa.Column('recorded_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_price_history_id', 'price_history', ['id'])
+        op.create_index('ix_price_history_product_id', 'price_history', ['product_id'])
+        op.create_index('ix_price_history_recorded_at', 'price_history', ['recorded_at'])
+        op.create_index('idx_product_recorded', 'price_history', ['product_id', 'recorded_at'])
 
 
 def downgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_table('price_history')
+    op.drop_table('price_alerts')
+    op.drop_table('products')
+    op.drop_table('users')
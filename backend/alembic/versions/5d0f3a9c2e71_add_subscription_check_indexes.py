@@ -0,0 +1,33 @@
+"""Add composite indexes for the price check subscription queries
+
+Revision ID: 5d0f3a9c2e71
+Revises: 67ca3f195b89
+Create Date: 2026-10-19 17:32:08.514226
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0f3a9c2e71'
+down_revision = '67ca3f195b89'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Alert evaluation and check_prices look up an item's active subscribers
+    op.create_index('idx_product_item_active', 'products', ['catalog_item_id', 'is_active'])
+    # Its leading column covers the single-column index, including for the foreign key
+    op.drop_index('ix_products_catalog_item_id', table_name='products')
+    # Lets the per-item MIN(check_interval_minutes) in check_prices read the index alone
+    op.create_index(
+        'idx_product_active_interval', 'products',
+        ['is_active', 'catalog_item_id', 'check_interval_minutes']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_product_active_interval', table_name='products')
+    op.create_index('ix_products_catalog_item_id', 'products', ['catalog_item_id'])
+    op.drop_index('idx_product_item_active', table_name='products')
@@ -0,0 +1,405 @@
+"""Split products into a shared catalog and per-user subscriptions
+
+Revision ID: 67ca3f195b89
+Revises: c816f208c824
+Create Date: 2026-10-19 15:26:11.804317
+
+"""
+import hashlib
+import struct
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '67ca3f195b89'
+down_revision = 'c816f208c824'
+branch_labels = None
+depends_on = None
+
+SPARKLINE_POINTS = 20
+BATCH_SIZE = 500
+# Points from different subscriptions of a page closer than this are one observation
+HISTORY_DEDUPE_WINDOW = timedelta(minutes=5)
+
+SCRAPED_COLUMNS = ['url', 'name', 'current_price', 'currency', 'image_url', 'last_checked_at', 'recent_prices']
+
+
+# URL canonicalisation and the sparkline format as of this revision, frozen
+# here so later changes to app.services do not change what the migration does
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_', 'psc', 'smid', 'spm'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+POINT = struct.Struct('<Iq')
+
+
+def canonicalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_hash(canonical_url: str) -> str:
+    return hashlib.sha256(canonical_url.encode('utf-8')).hexdigest()
+
+
+def pack_points(points) -> bytes:
+    return b''.join(
+        POINT.pack(int(recorded_at.replace(tzinfo=timezone.utc).timestamp()), int(Decimal(price) * 100))
+        for recorded_at, price in points
+    )
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _drop_foreign_keys(batch_op, table: str, column: str):
+    """Drop named foreign keys on `column`; SQLite's unnamed ones go with the batch rebuild."""
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk.get('name'):
+            batch_op.drop_constraint(fk['name'], type_='foreignkey')
+
+
+def _build_catalog(bind):
+    """Create one catalog item per canonical URL and point every product at it.
+
+    Returns the ids of items that several products collapsed into, and a map
+    from each redundant product to the one the same user keeps.
+    """
+    catalog = sa.Table(
+        'catalog_items', sa.MetaData(),
+        sa.Column('id', sa.Integer, primary_key=True), sa.Column('url', sa.Text), sa.Column('url_hash', sa.String),
+        sa.Column('name', sa.String), sa.Column('current_price', sa.DECIMAL(10, 2)),
+        sa.Column('currency', sa.String), sa.Column('image_url', sa.Text),
+        sa.Column('last_checked_at', sa.DateTime), sa.Column('recent_prices', sa.LargeBinary),
+        sa.Column('created_at', sa.DateTime), sa.Column('updated_at', sa.DateTime),
+    )
+    products = bind.execute(sa.text(
+        "SELECT id, user_id, url, name, current_price, currency, image_url, last_checked_at, "
+        "recent_prices, is_active, check_interval_minutes, created_at FROM products ORDER BY id"
+    ).columns(
+        current_price=sa.DECIMAL(10, 2), last_checked_at=sa.DateTime, recent_prices=sa.LargeBinary,
+        is_active=sa.Boolean, created_at=sa.DateTime
+    )).all()
+
+    groups = {}
+    for row in products:
+        groups.setdefault(canonicalize_url(row.url), []).append(row)
+
+    now = datetime.utcnow()
+    assignments = []
+    merged_items = []
+    survivors = {}
+    kept_settings = {}
+    for canonical, rows in groups.items():
+        source = max(rows, key=lambda row: (row.last_checked_at or datetime.min, row.id))
+        item_id = bind.execute(catalog.insert().values(
+            url=canonical,
+            url_hash=url_hash(canonical),
+            name=source.name,
+            current_price=source.current_price,
+            currency=source.currency,
+            image_url=source.image_url,
+            last_checked_at=source.last_checked_at,
+            recent_prices=source.recent_prices,
+            created_at=min((row.created_at for row in rows if row.created_at), default=now),
+            updated_at=now,
+        )).inserted_primary_key[0]
+        assignments.extend({'product_id': row.id, 'item_id': item_id} for row in rows)
+        if len(rows) > 1:
+            merged_items.append(item_id)
+
+        kept = {}
+        for row in rows:
+            survivor = kept.get(row.user_id)
+            if survivor is None:
+                kept[row.user_id] = row
+                kept_settings[row.id] = [bool(row.is_active), row.check_interval_minutes]
+                continue
+            survivors[row.id] = survivor.id
+            settings = kept_settings[survivor.id]
+            settings[0] = settings[0] or bool(row.is_active)
+            if row.check_interval_minutes is not None:
+                settings[1] = min(filter(None, (settings[1], row.check_interval_minutes)))
+
+    products_table = sa.table('products', sa.column('id', sa.Integer), sa.column('catalog_item_id', sa.Integer))
+    for batch in _chunks(assignments):
+        bind.execute(
+            products_table.update().where(products_table.c.id == sa.bindparam('product_id')).values(
+                catalog_item_id=sa.bindparam('item_id')
+            ),
+            batch
+        )
+
+    for survivor_id in set(survivors.values()):
+        is_active, interval = kept_settings[survivor_id]
+        bind.execute(
+            sa.text("UPDATE products SET is_active = :active, check_interval_minutes = :interval WHERE id = :id"),
+            {'active': is_active, 'interval': interval, 'id': survivor_id}
+        )
+    return merged_items, survivors
+
+
+def _merge_rollups(bind, merged_items):
+    rollups = sa.table(
+        'price_history_rollups',
+        sa.column('id', sa.Integer), sa.column('min_price', sa.DECIMAL(10, 2)),
+        sa.column('max_price', sa.DECIMAL(10, 2)), sa.column('avg_price', sa.DECIMAL(10, 2)),
+        sa.column('sample_count', sa.Integer),
+    )
+    for batch in _chunks(merged_items):
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, catalog_item_id, period_start, min_price, max_price, avg_price, sample_count "
+                "FROM price_history_rollups WHERE catalog_item_id IN :ids"
+            ).bindparams(sa.bindparam('ids', expanding=True)).columns(
+                period_start=sa.DateTime, min_price=sa.DECIMAL(10, 2),
+                max_price=sa.DECIMAL(10, 2), avg_price=sa.DECIMAL(10, 2)
+            ),
+            {'ids': batch}
+        ).all()
+
+        periods = {}
+        for row in rows:
+            periods.setdefault((row.catalog_item_id, row.period_start), []).append(row)
+
+        for period_rows in periods.values():
+            if len(period_rows) < 2:
+                continue
+            keep, *rest = sorted(period_rows, key=lambda row: row.id)
+            samples = sum(row.sample_count for row in period_rows)
+            bind.execute(rollups.update().where(rollups.c.id == keep.id).values(
+                min_price=min(row.min_price for row in period_rows),
+                max_price=max(row.max_price for row in period_rows),
+                avg_price=round(sum(row.avg_price * row.sample_count for row in period_rows) / samples, 2),
+                sample_count=samples,
+            ))
+            bind.execute(
+                sa.text("DELETE FROM price_history_rollups WHERE id IN :ids").bindparams(
+                    sa.bindparam('ids', expanding=True)
+                ),
+                {'ids': [row.id for row in rest]}
+            )
+
+
+def _dedupe_history(bind, merged_items):
+    """Collapse the per-user copies of a merged item's history into one stream.
+
+    Every subscription recorded the same page on its own schedule, so the
+    copies are the same price changes a few minutes apart. Walking the merged
+    points in time order, a point is kept only when its price differs from
+    the last kept one and it is not within HISTORY_DEDUPE_WINDOW of it.
+    """
+    catalog = sa.table('catalog_items', sa.column('id', sa.Integer), sa.column('recent_prices', sa.LargeBinary))
+    for batch in _chunks(merged_items):
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, catalog_item_id, price, recorded_at FROM price_history "
+                "WHERE catalog_item_id IN :ids ORDER BY catalog_item_id, recorded_at, id"
+            ).bindparams(sa.bindparam('ids', expanding=True)).columns(
+                price=sa.DECIMAL(10, 2), recorded_at=sa.DateTime
+            ),
+            {'ids': batch}
+        ).all()
+
+        kept = {}
+        dropped = []
+        for row in rows:
+            item_points = kept.setdefault(row.catalog_item_id, [])
+            if item_points:
+                last_at, last_price = item_points[-1]
+                if row.price == last_price or row.recorded_at - last_at < HISTORY_DEDUPE_WINDOW:
+                    dropped.append(row.id)
+                    continue
+            item_points.append((row.recorded_at, row.price))
+
+        for ids in _chunks(dropped):
+            bind.execute(
+                sa.text("DELETE FROM price_history WHERE id IN :ids").bindparams(sa.bindparam('ids', expanding=True)),
+                {'ids': ids}
+            )
+        for item_id, item_points in kept.items():
+            bind.execute(catalog.update().where(catalog.c.id == item_id).values(
+                recent_prices=pack_points(item_points[-SPARKLINE_POINTS:])
+            ))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_mysql = bind.dialect.name == 'mysql'
+    inspector = sa.inspect(bind)
+    # Databases once bootstrapped with Base.metadata.create_all may already
+    # have the rollups table in its catalog shape; it was created empty
+    rollups_by_product = 'product_id' in {
+        column['name'] for column in inspector.get_columns('price_history_rollups')
+    }
+
+    if 'catalog_items' not in inspector.get_table_names():
+        op.create_table(
+            'catalog_items',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('url', sa.Text(), nullable=False),
+            sa.Column('url_hash', sa.String(length=64), nullable=False),
+            sa.Column('name', sa.String(length=500), nullable=True),
+            sa.Column('current_price', sa.DECIMAL(10, 2), nullable=True),
+            sa.Column('currency', sa.String(length=10), nullable=True),
+            sa.Column('image_url', sa.Text(), nullable=True),
+            sa.Column('last_checked_at', sa.DateTime(), nullable=True),
+            sa.Column('recent_prices', sa.LargeBinary(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_catalog_items_id', 'catalog_items', ['id'])
+        op.create_index('ix_catalog_items_url_hash', 'catalog_items', ['url_hash'], unique=True)
+
+    op.add_column('products', sa.Column('catalog_item_id', sa.Integer(), nullable=True))
+    op.add_column('price_history', sa.Column('catalog_item_id', sa.Integer(), nullable=True))
+    if rollups_by_product:
+        op.add_column('price_history_rollups', sa.Column('catalog_item_id', sa.Integer(), nullable=True))
+
+    merged_items, survivors = _build_catalog(bind)
+
+    for table in ('price_history', 'price_history_rollups') if rollups_by_product else ('price_history',):
+        bind.execute(sa.text(
+            f"UPDATE {table} SET catalog_item_id = ("
+            f"  SELECT catalog_item_id FROM products WHERE products.id = {table}.product_id"
+            f")"
+        ))
+
+    # A user tracking the same page twice keeps one subscription with all alerts
+    if survivors:
+        bind.execute(
+            sa.text("UPDATE price_alerts SET product_id = :survivor WHERE product_id = :duplicate"),
+            [{'survivor': survivor, 'duplicate': duplicate} for duplicate, survivor in survivors.items()]
+        )
+        for batch in _chunks(survivors):
+            bind.execute(
+                sa.text("DELETE FROM products WHERE id IN :ids").bindparams(sa.bindparam('ids', expanding=True)),
+                {'ids': batch}
+            )
+
+    _merge_rollups(bind, merged_items)
+    _dedupe_history(bind, merged_items)
+
+    op.drop_index('idx_product_recorded', table_name='price_history')
+    op.drop_index('ix_price_history_product_id', table_name='price_history')
+    with op.batch_alter_table('price_history') as batch_op:
+        _drop_foreign_keys(batch_op, 'price_history', 'product_id')
+        batch_op.drop_column('product_id')
+        batch_op.alter_column('catalog_item_id', existing_type=sa.Integer(), nullable=False)
+        # Partitioned InnoDB tables cannot carry foreign keys
+        if not is_mysql:
+            batch_op.create_foreign_key(
+                'fk_price_history_catalog_item_id', 'catalog_items', ['catalog_item_id'], ['id'], ondelete='CASCADE'
+            )
+    op.create_index('ix_price_history_catalog_item_id', 'price_history', ['catalog_item_id'])
+    op.create_index('idx_item_recorded', 'price_history', ['catalog_item_id', 'recorded_at'])
+
+    if rollups_by_product:
+        op.drop_index('idx_rollup_product_period', table_name='price_history_rollups')
+        op.drop_index('ix_price_history_rollups_product_id', table_name='price_history_rollups')
+        with op.batch_alter_table('price_history_rollups') as batch_op:
+            _drop_foreign_keys(batch_op, 'price_history_rollups', 'product_id')
+            batch_op.drop_column('product_id')
+            batch_op.alter_column('catalog_item_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(
+                'fk_price_history_rollups_catalog_item_id', 'catalog_items', ['catalog_item_id'], ['id'],
+                ondelete='CASCADE'
+            )
+        op.create_index('ix_price_history_rollups_catalog_item_id', 'price_history_rollups', ['catalog_item_id'])
+        op.create_index(
+            'idx_rollup_item_period', 'price_history_rollups', ['catalog_item_id', 'period_start'], unique=True
+        )
+
+    with op.batch_alter_table('products') as batch_op:
+        for column in SCRAPED_COLUMNS:
+            batch_op.drop_column(column)
+        batch_op.alter_column('catalog_item_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_products_catalog_item_id', 'catalog_items', ['catalog_item_id'], ['id'])
+    op.create_index('ix_products_catalog_item_id', 'products', ['catalog_item_id'])
+    op.create_index('idx_product_user_item', 'products', ['user_id', 'catalog_item_id'], unique=True)
+
+
+def downgrade() -> None:
+    # History that was merged across users is handed back to the oldest
+    # subscription of each item; items nobody subscribes to lose their history.
+    bind = op.get_bind()
+    is_mysql = bind.dialect.name == 'mysql'
+
+    op.drop_index('idx_product_user_item', table_name='products')
+    op.drop_index('ix_products_catalog_item_id', table_name='products')
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_constraint('fk_products_catalog_item_id', type_='foreignkey')
+        batch_op.add_column(sa.Column('url', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('name', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('current_price', sa.DECIMAL(10, 2), nullable=True))
+        batch_op.add_column(sa.Column('currency', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('image_url', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('last_checked_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('recent_prices', sa.LargeBinary(), nullable=True))
+
+    bind.execute(sa.text(
+        "UPDATE products SET "
+        + ", ".join(
+            f"{column} = (SELECT {column} FROM catalog_items WHERE catalog_items.id = products.catalog_item_id)"
+            for column in SCRAPED_COLUMNS
+        )
+    ))
+
+    for table in ('price_history', 'price_history_rollups'):
+        op.add_column(table, sa.Column('product_id', sa.Integer(), nullable=True))
+        bind.execute(sa.text(
+            f"UPDATE {table} SET product_id = ("
+            f"  SELECT MIN(products.id) FROM products WHERE products.catalog_item_id = {table}.catalog_item_id"
+            f")"
+        ))
+        bind.execute(sa.text(f"DELETE FROM {table} WHERE product_id IS NULL"))
+
+    op.drop_index('idx_rollup_item_period', table_name='price_history_rollups')
+    op.drop_index('ix_price_history_rollups_catalog_item_id', table_name='price_history_rollups')
+    with op.batch_alter_table('price_history_rollups') as batch_op:
+        batch_op.drop_constraint('fk_price_history_rollups_catalog_item_id', type_='foreignkey')
+        batch_op.drop_column('catalog_item_id')
+        batch_op.alter_column('product_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            'price_history_rollups_ibfk_1', 'products', ['product_id'], ['id'], ondelete='CASCADE'
+        )
+    op.create_index('ix_price_history_rollups_product_id', 'price_history_rollups', ['product_id'])
+    op.create_index('idx_rollup_product_period', 'price_history_rollups', ['product_id', 'period_start'], unique=True)
+
+    op.drop_index('idx_item_recorded', table_name='price_history')
+    op.drop_index('ix_price_history_catalog_item_id', table_name='price_history')
+    with op.batch_alter_table('price_history') as batch_op:
+        if not is_mysql:
+            batch_op.drop_constraint('fk_price_history_catalog_item_id', type_='foreignkey')
+        batch_op.drop_column('catalog_item_id')
+        batch_op.alter_column('product_id', existing_type=sa.Integer(), nullable=False)
+        if not is_mysql:
+            batch_op.create_foreign_key(
+                'price_history_ibfk_1', 'products', ['product_id'], ['id'], ondelete='CASCADE'
+            )
+    op.create_index('ix_price_history_product_id', 'price_history', ['product_id'])
+    op.create_index('idx_product_recorded', 'price_history', ['product_id', 'recorded_at'])
+
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('catalog_item_id')
+        batch_op.alter_column('url', existing_type=sa.Text(), nullable=False)
+
+    op.drop_index('ix_catalog_items_url_hash', table_name='catalog_items')
+    op.drop_index('ix_catalog_items_id', table_name='catalog_items')
+    op.drop_table('catalog_items')
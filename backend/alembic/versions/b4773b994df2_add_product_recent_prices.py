@@ -0,0 +1,71 @@
+"""Add packed recent_prices sparkline buffer to products
+
+Revision ID: b4773b994df2
+Revises: ddbed24140fa
+Create Date: 2026-10-19 11:40:05.531977
+
+"""
+import struct
+from datetime import timezone
+from decimal import Decimal
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4773b994df2'
+down_revision = 'ddbed24140fa'
+branch_labels = None
+depends_on = None
+
+SPARKLINE_POINTS = 20
+BATCH_SIZE = 500
+
+# The sparkline format as of this revision, frozen here so later changes to
+# app.services.sparkline do not change what the migration writes
+POINT = struct.Struct('<Iq')
+
+
+def pack_points(points) -> bytes:
+    return b''.join(
+        POINT.pack(int(recorded_at.replace(tzinfo=timezone.utc).timestamp()), int(Decimal(price) * 100))
+        for recorded_at, price in points
+    )
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('recent_prices', sa.LargeBinary(), nullable=True))
+
+    bind = op.get_bind()
+    products = sa.table('products', sa.column('id', sa.Integer), sa.column('recent_prices', sa.LargeBinary))
+    product_ids = [row[0] for row in bind.execute(sa.text("SELECT id FROM products"))]
+
+    for start in range(0, len(product_ids), BATCH_SIZE):
+        batch = product_ids[start:start + BATCH_SIZE]
+        rows = bind.execute(
+            sa.text(
+                "SELECT product_id, price, recorded_at FROM ("
+                "  SELECT product_id, price, recorded_at, ROW_NUMBER() OVER ("
+                "    PARTITION BY product_id ORDER BY recorded_at DESC"
+                "  ) AS recent_rank FROM price_history WHERE product_id IN :ids"
+                ") ranked WHERE recent_rank <= :points ORDER BY product_id, recorded_at"
+            ).bindparams(sa.bindparam('ids', expanding=True)).columns(
+                price=sa.DECIMAL(10, 2), recorded_at=sa.DateTime
+            ),
+            {'ids': batch, 'points': SPARKLINE_POINTS}
+        ).all()
+
+        points = {}
+        for product_id, price, recorded_at in rows:
+            points.setdefault(product_id, []).append((recorded_at, price))
+
+        for product_id, product_points in points.items():
+            bind.execute(
+                products.update().where(products.c.id == product_id).values(
+                    recent_prices=pack_points(product_points)
+                )
+            )
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'recent_prices')
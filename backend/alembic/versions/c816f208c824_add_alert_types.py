@@ -0,0 +1,37 @@
+"""Add alert types with precomputed trigger prices
+
+Revision ID: c816f208c824
+Revises: b4773b994df2
+Create Date: 2026-10-19 14:02:37.210448
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c816f208c824'
+down_revision = 'b4773b994df2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing alerts are absolute targets, whose target_price already is the
+    # trigger price, so no backfill is needed.
+    op.add_column('price_alerts', sa.Column(
+        'alert_type', sa.String(length=32), nullable=False, server_default='target_price'
+    ))
+    op.add_column('price_alerts', sa.Column('threshold_percent', sa.DECIMAL(5, 2), nullable=True))
+    op.add_column('price_alerts', sa.Column('baseline_price', sa.DECIMAL(10, 2), nullable=True))
+    op.create_index(
+        'idx_alert_pending_target', 'price_alerts',
+        ['product_id', 'is_active', 'triggered_at', 'target_price']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_alert_pending_target', table_name='price_alerts')
+    op.drop_column('price_alerts', 'baseline_price')
+    op.drop_column('price_alerts', 'threshold_percent')
+    op.drop_column('price_alerts', 'alert_type')
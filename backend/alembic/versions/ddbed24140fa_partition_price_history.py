@@ -0,0 +1,93 @@
+"""Partition price_history by month and add rollups
+
+Revision ID: ddbed24140fa
+Revises: 30ffb2b5af86
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from datetime import date, datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ddbed24140fa'
+down_revision = '30ffb2b5af86'
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'price_history_rollups' not in tables:
+        op.create_table(
+            'price_history_rollups',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('period_start', sa.DateTime(), nullable=False),
+            sa.Column('min_price', sa.DECIMAL(10, 2), nullable=False),
+            sa.Column('max_price', sa.DECIMAL(10, 2), nullable=False),
+            sa.Column('avg_price', sa.DECIMAL(10, 2), nullable=False),
+            sa.Column('sample_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_price_history_rollups_id', 'price_history_rollups', ['id'])
+        op.create_index('ix_price_history_rollups_product_id', 'price_history_rollups', ['product_id'])
+        op.create_index('idx_rollup_product_period', 'price_history_rollups', ['product_id', 'period_start'], unique=True)
+
+    if bind.dialect.name != 'mysql' or 'price_history' not in tables:
+        return
+
+    # Partitioned InnoDB tables cannot carry foreign keys and every unique key
+    # must include the partitioning column. Product deletes still cascade
+    # through the ORM relationship.
+    for fk in inspector.get_foreign_keys('price_history'):
+        op.execute(f"ALTER TABLE price_history DROP FOREIGN KEY {fk['name']}")
+    op.execute("ALTER TABLE price_history DROP PRIMARY KEY, ADD PRIMARY KEY (id, recorded_at)")
+
+    oldest = bind.execute(sa.text("SELECT MIN(recorded_at) FROM price_history")).scalar() or datetime.utcnow()
+    month = date(oldest.year, oldest.month, 1)
+    last = _add_months(date.today().replace(day=1), PARTITIONS_AHEAD)
+
+    definitions = []
+    while month <= last:
+        upper = _add_months(month, 1)
+        definitions.append(
+            f"PARTITION p{month.year:04d}{month.month:02d} VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+        )
+        month = upper
+    definitions.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    op.execute(
+        "ALTER TABLE price_history PARTITION BY RANGE (TO_DAYS(recorded_at)) ("
+        + ", ".join(definitions)
+        + ")"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'mysql':
+        op.execute("ALTER TABLE price_history REMOVE PARTITIONING")
+        op.execute("ALTER TABLE price_history DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+        op.execute(
+            "ALTER TABLE price_history ADD CONSTRAINT price_history_ibfk_1 "
+            "FOREIGN KEY (product_id) REFERENCES products (id) ON DELETE CASCADE"
+        )
+
+    op.drop_index('idx_rollup_product_period', table_name='price_history_rollups')
+    op.drop_index('ix_price_history_rollups_product_id', table_name='price_history_rollups')
+    op.drop_index('ix_price_history_rollups_id', table_name='price_history_rollups')
+    op.drop_table('price_history_rollups')
@@ -0,0 +1,59 @@
+"""Re-run extraction over archived pages and diff price, name and image against the catalog.
+
+Usage: python -m app.commands.reextract [--archive archive/pages] [--workers N]
+                                        [--report diff.ndjson] [--apply] [--include-stale]
+"""
+import argparse
+import time
+from collections import Counter
+import orjson
+from app.config import settings
+from app.database import SessionLocal
+from app.services.page_archive import PageArchive
+from app.services.reextract_service import ReextractService
+from app.services.cache_service import response_cache
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--archive', default=settings.SCRAPER_ARCHIVE_DIR)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--report', help="write one NDJSON row per page")
+    parser.add_argument('--apply', action='store_true', help="write corrections to the catalog")
+    parser.add_argument('--include-stale', action='store_true',
+                        help="also diff pages recorded before the item's last check")
+    args = parser.parse_args()
+
+    service = ReextractService(PageArchive(args.archive), workers=args.workers, chunk_size=args.chunk_size)
+    statuses = Counter()
+    fields = Counter()
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    report = open(args.report, 'wb') if args.report else None
+    try:
+        for row in service.run(db, apply=args.apply, include_stale=args.include_stale):
+            statuses[row['status']] += 1
+            fields.update(row.get('changes', {}).keys())
+            if report:
+                report.write(orjson.dumps(row) + b'\n')
+    finally:
+        db.close()
+        if report:
+            report.close()
+
+    if args.apply and statuses['changed']:
+        response_cache.invalidate_all()
+
+    elapsed = time.perf_counter() - started
+    total = sum(statuses.values())
+    print(f"pages={total} workers={service.workers} elapsed={elapsed:.1f}s rate={total / elapsed if elapsed else 0:.0f} pages/s")
+    print("status: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+    print("changed fields: " + (", ".join(f"{field}={count}" for field, count in sorted(fields.items())) or "none"))
+    if statuses['changed']:
+        print("corrections applied" if args.apply else "dry run: pass --apply to write corrections")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,20 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     REDIS_URL: str
     
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_REPLICA_POOL_SIZE: int = 20
+    DB_REPLICA_MAX_OVERFLOW: int = 20
+    REPLICA_LAG_GRACE_SECONDS: int = 10
+    WORKER_DB_POOL_SIZE: int = 2
+    WORKER_DB_MAX_OVERFLOW: int = 2
+    
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     GOOGLE_REDIRECT_URI: Optional[str] = None
@@ -21,6 +31,60 @@ class Settings(BaseSettings):
     
     FRONTEND_URL: str = "http://localhost:5173"
     
+    HISTORY_RETENTION_MONTHS: int = 12
+    HISTORY_PARTITIONS_AHEAD: int = 3
+    HISTORY_ARCHIVE_DIR: str = "archive/price_history"
+    CATALOG_ORPHAN_RETENTION_DAYS: int = 30
+    HISTORY_WRITE_BEHIND: bool = False
+    HISTORY_STREAM_KEY: str = "history:observations"
+    HISTORY_WRITER_BATCH_SIZE: int = 1000
+    HISTORY_WRITER_BLOCK_MS: int = 1000
+    HISTORY_WRITER_CLAIM_IDLE_MS: int = 60000
+    HISTORY_WRITER_INTERVAL_SECONDS: int = 10
+    HISTORY_WRITER_MAX_SECONDS: int = 8
+    
+    IMPORT_MAX_ROWS: int = 5000
+    IMPORT_BATCH_SIZE: int = 200
+    
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    
+    GZIP_MINIMUM_SIZE: int = 1024
+    
+    SPARKLINE_POINTS: int = 20
+    
+    EVENTS_ENABLED: bool = True
+    EVENTS_KEEPALIVE_SECONDS: int = 15
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_TICKET_TTL_SECONDS: int = 60
+    
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.05
+    PROFILING_SLOW_REQUEST_MS: int = 1000
+    PROFILING_TOP_QUERIES: int = 5
+    
+    SCRAPER_STREAMING_ENABLED: bool = True
+    SCRAPER_MAX_BYTES: int = 2_000_000
+    SCRAPER_CHUNK_BYTES: int = 16384
+    SCRAPER_ARCHIVE_MODE: str = "off"
+    SCRAPER_ARCHIVE_DIR: str = "archive/pages"
+    SCRAPER_RULES_DIR: str = "site_rules"
+    SCRAPER_PARSE_POOL_ENABLED: bool = True
+    SCRAPER_PARSE_WORKERS: int = 2
+    SCRAPER_PARSE_MAX_PENDING: int = 64
+    SCRAPER_CONCURRENCY: int = 16
+    SCRAPER_PER_HOST_LIMIT: int = 4
+    SCRAPER_RESULT_CACHE_SECONDS: int = 60
+    SCRAPER_RESULT_CACHE_SIZE: int = 5000
+    SCRAPER_SERVICE_URL: Optional[str] = None
+    SCRAPER_SERVICE_TOKEN: Optional[str] = None
+    METRICS_TOKEN: Optional[str] = None
+    SCRAPER_SERVICE_TIMEOUT: int = 300
+    SCRAPER_BATCH_MAX_URLS: int = 200
+    
+    PLAYWRIGHT_BLOCK_RESOURCES: bool = True
+    PLAYWRIGHT_ALLOWLIST: Dict[str, List[str]] = {}
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,21 +1,102 @@
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.services.metrics_service import metrics
 
-engine = create_engine(
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(
+                "db_pool_checkout_wait_seconds",
+                time.perf_counter() - started,
+                {"pool": self.metrics_name}
+            )
+
+def create_db_engine(url: str, name: str, pool_size: int, max_overflow: int) -> Engine:
+    options = {"pool_pre_ping": True, "pool_recycle": 3600}
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database not in (None, "", ":memory:"):
+        options.update(
+            poolclass=type(f"TimedQueuePool_{name}", (TimedQueuePool,), {"metrics_name": name}),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return create_engine(url, **options)
+
+engine = create_db_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    "primary",
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
 )
 
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_db_engine(
+        settings.DATABASE_REPLICA_URL,
+        "replica",
+        settings.DB_REPLICA_POOL_SIZE,
+        settings.DB_REPLICA_MAX_OVERFLOW,
+    )
+else:
+    replica_engine = engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
 
 Base = declarative_base()
 
+def configure_worker_engine() -> Engine:
+    """Rebind SessionLocal to an engine sized for a Celery worker process."""
+    global engine
+    engine.dispose(close=False)
+    engine = create_db_engine(
+        settings.DATABASE_URL,
+        "worker",
+        settings.WORKER_DB_POOL_SIZE,
+        settings.WORKER_DB_MAX_OVERFLOW,
+    )
+    SessionLocal.configure(bind=engine)
+    return engine
+
+def pool_status() -> dict:
+    engines = {"primary": engine}
+    if replica_engine is not engine:
+        engines["replica"] = replica_engine
+
+    status = {}
+    for name, db_engine in engines.items():
+        pool = db_engine.pool
+        if isinstance(pool, QueuePool):
+            status[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checked_in": pool.checkedin(),
+            }
+    return status
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,19 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.config import settings
-from app.routes import auth, products, alerts, history
-from app.database import Base, engine
+from app.middleware.compression import SelectiveGZipMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.metrics_auth import require_metrics_token
+from app.routes import auth, products, alerts, history, stats, dashboard, events
+from app.database import pool_status
+from app.services.metrics_service import metrics
+from app.services.profiler import request_profiler
+from app.services.serializer import ProfiledORJSONResponse
 import secrets
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Price Drop Notification API",
     description="Track product prices and get notified when prices drop",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ProfiledORJSONResponse
 )
 
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE, exclude_paths=("/events",))
+
 app.add_middleware(
     SessionMiddleware,
     secret_key=settings.JWT_SECRET_KEY,
@@ -29,11 +36,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        slow_request_ms=settings.PROFILING_SLOW_REQUEST_MS,
+        top_queries=settings.PROFILING_TOP_QUERIES,
+        exclude_paths=("/events",)
+    )
+
 app.include_router(auth.router)
+# Registered ahead of products so /products/stats is not captured by /products/{product_id}
+app.include_router(stats.router)
 app.include_router(products.router)
 app.include_router(alerts.router)
 app.include_router(alerts.router_alerts)
 app.include_router(history.router)
+app.include_router(history.router_export)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 
 @app.get("/")
 async def root():
@@ -43,6 +64,10 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    return {**metrics.snapshot(), "db_pools": pool_status(), "routes": request_profiler.snapshot()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,17 +1,16 @@
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.services.auth_service import verify_token
-from app.database import get_db
+from app.services.auth_service import verify_token, EVENT_TICKET_SCOPE
+from app.database import get_db, SessionLocal, ReadSessionLocal
+from app.services.cache_service import response_cache
 from app.models.user import User
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
+def _user_from_token(token: str, db: Session, scope: Optional[str] = None) -> User:
     payload = verify_token(token)
     
     if payload is None:
@@ -20,6 +19,14 @@ async def get_current_user(
             detail="Invalid or expired token"
         )
     
+    # Scoped tickets only open what they were issued for, and session
+    # tokens are not accepted where a ticket is expected
+    if payload.get("scope") != scope:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token scope"
+        )
+    
     user_id = payload.get("user_id")
     if user_id is None:
         raise HTTPException(
@@ -34,4 +41,42 @@ async def get_current_user(
             detail="User not found"
         )
     
+    # Hand the connection back to the pool before the route runs; read-only
+    # routes query through a separate replica session.
+    db.expunge(user)
+    db.rollback()
+    
     return user
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    return _user_from_token(credentials.credentials, db)
+
+async def get_current_user_from_header_or_ticket(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    ticket: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+) -> User:
+    """Authenticate clients such as EventSource that cannot send an Authorization header.
+
+    Those pass a ticket from POST /events/ticket in the query string instead
+    of the session token, which would otherwise end up in access logs.
+    """
+    if credentials is not None:
+        return _user_from_token(credentials.credentials, db)
+    if ticket:
+        return _user_from_token(ticket, db, scope=EVENT_TICKET_SCOPE)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated"
+    )
+
+def get_user_read_db(current_user: User = Depends(get_current_user)):
+    """Replica session, or a primary one while the user's own recent writes may not have replicated yet."""
+    db = SessionLocal() if response_cache.recently_wrote(current_user.id) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
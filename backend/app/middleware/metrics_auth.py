@@ -0,0 +1,11 @@
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException, status
+from app.config import settings
+
+async def require_metrics_token(x_metrics_token: Optional[str] = Header(None)):
+    """Guard /metrics; without METRICS_TOKEN configured the endpoint stays closed."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(x_metrics_token or "", settings.METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
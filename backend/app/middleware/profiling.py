@@ -0,0 +1,51 @@
+import random
+import time
+from typing import Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.profiler import request_profiler
+
+class ProfilingMiddleware:
+    """Times each request and attributes a sampled share of them to SQL, serialization and scraping."""
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.05, slow_request_ms: int = 1000,
+                 top_queries: int = 5, exclude_paths: Tuple[str, ...] = ()):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_request_ms / 1000
+        self.top_queries = top_queries
+        self.exclude_paths = exclude_paths
+        request_profiler.install()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        profile = token = None
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            profile, token = request_profiler.start(self.top_queries)
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            if token is not None:
+                request_profiler.finish(token)
+            route = scope.get("route")
+            request_profiler.record(
+                scope["method"],
+                route.path if route is not None else "<unmatched>",
+                status,
+                elapsed,
+                profile,
+                self.slow_threshold
+            )
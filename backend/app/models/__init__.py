@@ -1,6 +1,8 @@
 from app.models.user import User
+from app.models.catalog_item import CatalogItem
 from app.models.product import Product
 from app.models.price_alert import PriceAlert
 from app.models.price_history import PriceHistory
+from app.models.price_history_rollup import PriceHistoryRollup
 
-__all__ = ["User", "Product", "PriceAlert", "PriceHistory"]
+__all__ = ["User", "CatalogItem", "Product", "PriceAlert", "PriceHistory", "PriceHistoryRollup"]
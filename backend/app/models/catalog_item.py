@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, DECIMAL, LargeBinary
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+class CatalogItem(Base):
+    """A scraped product page shared by every user who tracks its canonical URL."""
+    
+    __tablename__ = "catalog_items"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    url = Column(Text, nullable=False)
+    url_hash = Column(String(64), nullable=False, unique=True, index=True)
+    name = Column(String(500))
+    current_price = Column(DECIMAL(10, 2))
+    currency = Column(String(10), default="USD")
+    image_url = Column(Text)
+    last_checked_at = Column(DateTime)
+    recent_prices = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    subscriptions = relationship("Product", back_populates="catalog_item")
+    price_history = relationship("PriceHistory", back_populates="catalog_item", cascade="all, delete-orphan")
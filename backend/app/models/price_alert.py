@@ -1,16 +1,29 @@
-from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
+ALERT_TYPE_TARGET_PRICE = "target_price"
+ALERT_TYPE_PERCENT_DROP = "percent_drop"
+ALERT_TYPE_ALL_TIME_LOW = "all_time_low"
+ALERT_TYPE_DROP_SINCE_LAST_CHECK = "drop_since_last_check"
+
 class PriceAlert(Base):
     __tablename__ = "price_alerts"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    alert_type = Column(String(32), nullable=False, default=ALERT_TYPE_TARGET_PRICE, server_default=ALERT_TYPE_TARGET_PRICE)
+    # Highest price that fires the alert, precomputed for every alert type
     target_price = Column(DECIMAL(10, 2), nullable=False)
+    threshold_percent = Column(DECIMAL(5, 2), nullable=True)
+    baseline_price = Column(DECIMAL(10, 2), nullable=True)
     is_active = Column(Boolean, default=True, index=True)
     triggered_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     product = relationship("Product", back_populates="alerts")
+    
+    __table_args__ = (
+        Index('idx_alert_pending_target', 'product_id', 'is_active', 'triggered_at', 'target_price'),
+    )
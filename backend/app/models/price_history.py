@@ -7,12 +7,12 @@ class PriceHistory(Base):
     __tablename__ = "price_history"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    catalog_item_id = Column(Integer, ForeignKey("catalog_items.id", ondelete="CASCADE"), nullable=False, index=True)
     price = Column(DECIMAL(10, 2), nullable=False)
     recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     
-    product = relationship("Product", back_populates="price_history")
+    catalog_item = relationship("CatalogItem", back_populates="price_history")
     
     __table_args__ = (
-        Index('idx_product_recorded', 'product_id', 'recorded_at'),
+        Index('idx_item_recorded', 'catalog_item_id', 'recorded_at'),
     )
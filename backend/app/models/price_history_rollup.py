@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, DECIMAL, Index
+from app.database import Base
+
+class PriceHistoryRollup(Base):
+    __tablename__ = "price_history_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    catalog_item_id = Column(Integer, ForeignKey("catalog_items.id", ondelete="CASCADE"), nullable=False, index=True)
+    period_start = Column(DateTime, nullable=False)
+    min_price = Column(DECIMAL(10, 2), nullable=False)
+    max_price = Column(DECIMAL(10, 2), nullable=False)
+    avg_price = Column(DECIMAL(10, 2), nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_rollup_item_period', 'catalog_item_id', 'period_start', unique=True),
+    )
@@ -1,24 +1,38 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Product(Base):
+    """A user's subscription to a catalog item, holding their check interval and alerts."""
+    
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    url = Column(Text, nullable=False)
-    name = Column(String(500))
-    current_price = Column(DECIMAL(10, 2))
-    currency = Column(String(10), default="USD")
-    image_url = Column(Text)
+    catalog_item_id = Column(Integer, ForeignKey("catalog_items.id"), nullable=False)
     is_active = Column(Boolean, default=True, index=True)
     check_interval_minutes = Column(Integer, default=60)
-    last_checked_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="products")
+    catalog_item = relationship("CatalogItem", back_populates="subscriptions", lazy="joined")
     alerts = relationship("PriceAlert", back_populates="product", cascade="all, delete-orphan")
-    price_history = relationship("PriceHistory", back_populates="product", cascade="all, delete-orphan")
+    
+    url = association_proxy("catalog_item", "url")
+    name = association_proxy("catalog_item", "name")
+    current_price = association_proxy("catalog_item", "current_price")
+    currency = association_proxy("catalog_item", "currency")
+    image_url = association_proxy("catalog_item", "image_url")
+    last_checked_at = association_proxy("catalog_item", "last_checked_at")
+    recent_prices = association_proxy("catalog_item", "recent_prices")
+    
+    __table_args__ = (
+        Index('idx_product_user_item', 'user_id', 'catalog_item_id', unique=True),
+        # Subscribers of an item during price checks and alert evaluation
+        Index('idx_product_item_active', 'catalog_item_id', 'is_active'),
+        # Covers the per-item check interval aggregate in check_prices
+        Index('idx_product_active_interval', 'is_active', 'catalog_item_id', 'check_interval_minutes'),
+    )
@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
-from app.middleware.auth_middleware import get_current_user
+from app.middleware.auth_middleware import get_current_user, get_user_read_db
 from app.models.user import User
 from app.models.product import Product
 from app.models.price_alert import PriceAlert
 from app.schemas.alert import AlertCreate, AlertUpdate, AlertResponse
+from app.services.cache_service import response_cache
+from app.services.alert_service import alert_service, THRESHOLD_FIELDS
 
 router = APIRouter(prefix="/products/{product_id}/alerts", tags=["alerts"])
 
@@ -30,18 +32,29 @@ async def create_alert(
     
     alert = PriceAlert(
         product_id=product_id,
-        target_price=alert_data.target_price
+        alert_type=alert_data.alert_type,
+        target_price=alert_data.target_price,
+        threshold_percent=alert_data.threshold_percent,
+        baseline_price=alert_data.baseline_price
     )
+    try:
+        alert_service.apply_threshold(db, alert, product)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     db.add(alert)
     db.commit()
     db.refresh(alert)
+    response_cache.invalidate_user(current_user.id)
     
     return alert
 
 @router.get("", response_model=List[AlertResponse])
 async def get_alerts(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_user_read_db),
     current_user: User = Depends(get_current_user)
 ):
     product = db.query(Product).filter(
@@ -78,13 +91,37 @@ async def update_alert(
             detail="Alert not found"
         )
     
-    if alert_data.target_price is not None:
-        alert.target_price = alert_data.target_price
+    thresholds = {
+        field: value for field, value in alert_data.model_dump(exclude={'is_active'}).items()
+        if value is not None
+    }
+    not_applicable = sorted(thresholds.keys() - THRESHOLD_FIELDS[alert.alert_type])
+    if not_applicable:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{', '.join(not_applicable)} cannot be set on {alert.alert_type} alerts"
+        )
+    
+    changed = {field for field, value in thresholds.items() if getattr(alert, field) != value}
+    for field in changed:
+        setattr(alert, field, thresholds[field])
     if alert_data.is_active is not None:
         alert.is_active = alert_data.is_active
     
+    # Re-levelling moves relative alerts to the current price, so it only
+    # happens when an input to the threshold changed
+    if changed:
+        try:
+            alert_service.apply_threshold(db, alert, alert.product)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
     db.commit()
     db.refresh(alert)
+    response_cache.invalidate_user(current_user.id)
     
     return alert
 
@@ -107,5 +144,6 @@ async def delete_alert(
     
     db.delete(alert)
     db.commit()
+    response_cache.invalidate_user(current_user.id)
     
     return None
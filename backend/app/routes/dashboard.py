@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.middleware.auth_middleware import get_current_user, get_user_read_db
+from app.models.user import User
+from app.models.catalog_item import CatalogItem
+from app.models.product import Product
+from app.models.price_alert import PriceAlert
+from app.schemas.dashboard import DashboardSummary
+from app.services.dashboard_service import dashboard_service
+from app.services.cache_service import response_cache, make_etag
+from app.services.serializer import dumps
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    def compute_etag() -> str:
+        count, last_updated, last_priced = db.query(
+            func.count(Product.id), func.max(Product.updated_at), func.max(CatalogItem.updated_at)
+        ).join(CatalogItem).filter(
+            Product.user_id == current_user.id
+        ).one()
+        alerts, last_alert, last_triggered = db.query(
+            func.count(PriceAlert.id), func.max(PriceAlert.id), func.max(PriceAlert.triggered_at)
+        ).join(Product).filter(
+            Product.user_id == current_user.id,
+            PriceAlert.is_active == True
+        ).one()
+        return make_etag("dashboard", current_user.id, count, last_updated, last_priced, alerts, last_alert, last_triggered)
+    
+    return response_cache.conditional_response(
+        current_user.id,
+        "dashboard",
+        if_none_match,
+        compute_etag,
+        lambda: dumps(dashboard_service.summary(db, current_user.id))
+    )
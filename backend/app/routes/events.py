@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.middleware.auth_middleware import get_current_user, get_current_user_from_header_or_ticket
+from app.models.user import User
+from app.services.auth_service import create_event_ticket
+from app.services.event_service import event_hub
+import asyncio
+import json
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+async def _event_stream(user_id: int):
+    queue = event_hub.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            event = json.loads(data)
+            yield f"event: {event['type']}\ndata: {data.decode()}\n\n"
+    finally:
+        event_hub.unsubscribe(user_id, queue)
+
+@router.post("/ticket")
+async def issue_ticket(current_user: User = Depends(get_current_user)):
+    return {"ticket": create_event_ticket(current_user.id), "expires_in": settings.EVENTS_TICKET_TTL_SECONDS}
+
+@router.get("/stream")
+async def stream_events(current_user: User = Depends(get_current_user_from_header_or_ticket)):
+    return StreamingResponse(
+        _event_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,28 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, literal, Integer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
-from app.database import get_db
-from app.middleware.auth_middleware import get_current_user
+from app.middleware.auth_middleware import get_current_user, get_user_read_db
 from app.models.user import User
 from app.models.product import Product
 from app.models.price_history import PriceHistory
 from app.schemas.alert import PriceHistoryResponse
+from app.services.retention_service import retention_service
+from app.services.export_service import stream_history, EXPORT_MEDIA_TYPES
+from app.services.cache_service import response_cache, make_etag
+from app.services.serializer import dumps_rows
 
 router = APIRouter(prefix="/products/{product_id}/history", tags=["history"])
 
-@router.get("", response_model=List[PriceHistoryResponse])
-async def get_price_history(
-    product_id: int,
-    start_date: Optional[datetime] = Query(None),
-    end_date: Optional[datetime] = Query(None),
-    limit: int = Query(1000, ge=1, le=10000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+HISTORY_FIELDS = ('id', 'product_id', 'price', 'recorded_at')
+
+def _history_columns(product_id_column):
+    """History columns labelled with the subscription id the API exposes as product_id."""
+    return (PriceHistory.id, product_id_column.label('product_id'), PriceHistory.price, PriceHistory.recorded_at)
+
+def _get_product(db: Session, product_id: int, user: User) -> Product:
     product = db.query(Product).filter(
         Product.id == product_id,
-        Product.user_id == current_user.id
+        Product.user_id == user.id
     ).first()
     
     if not product:
@@ -30,14 +33,105 @@ async def get_price_history(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
+    return product
+
+@router.get("", response_model=List[PriceHistoryResponse])
+async def get_price_history(
+    product_id: int,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    limit: int = Query(1000, ge=1, le=10000),
+    include_archived: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    cache_field = f"history:{product_id}:{start_date}:{end_date}:{limit}:{include_archived}"
+    
+    catalog_item_id = None
+    
+    def compute_etag() -> str:
+        nonlocal catalog_item_id
+        catalog_item_id = _get_product(db, product_id, current_user).catalog_item_id
+        
+        count, latest = db.query(func.count(PriceHistory.id), func.max(PriceHistory.recorded_at)).filter(
+            PriceHistory.catalog_item_id == catalog_item_id
+        ).one()
+        return make_etag(cache_field, count, latest)
     
-    query = db.query(PriceHistory).filter(PriceHistory.product_id == product_id)
+    def build_body() -> bytes:
+        stmt = select(*_history_columns(literal(product_id, Integer))).where(PriceHistory.catalog_item_id == catalog_item_id)
+        
+        if start_date:
+            stmt = stmt.where(PriceHistory.recorded_at >= start_date)
+        if end_date:
+            stmt = stmt.where(PriceHistory.recorded_at <= end_date)
+        
+        history = db.execute(stmt.order_by(PriceHistory.recorded_at.desc()).limit(limit)).all()
+        
+        if include_archived and len(history) < limit:
+            history.extend(
+                (row['id'], product_id, row['price'], row['recorded_at'])
+                for row in retention_service.archive.read(
+                    catalog_item_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=limit - len(history),
+                    legacy_product_id=product_id
+                )
+            )
+        
+        return dumps_rows(HISTORY_FIELDS, history)
     
+    return response_cache.conditional_response(
+        current_user.id, cache_field, if_none_match, compute_etag, build_body
+    )
+
+def _export_response(stmt, fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_history(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
+
+def _export_select(product_id_column, start_date: Optional[datetime], end_date: Optional[datetime]):
+    stmt = select(*_history_columns(product_id_column))
     if start_date:
-        query = query.filter(PriceHistory.recorded_at >= start_date)
+        stmt = stmt.where(PriceHistory.recorded_at >= start_date)
     if end_date:
-        query = query.filter(PriceHistory.recorded_at <= end_date)
+        stmt = stmt.where(PriceHistory.recorded_at <= end_date)
+    return stmt
+
+@router.get("/export")
+async def export_price_history(
+    product_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    product = _get_product(db, product_id, current_user)
+    
+    stmt = _export_select(literal(product_id, Integer), start_date, end_date).where(
+        PriceHistory.catalog_item_id == product.catalog_item_id
+    ).order_by(PriceHistory.recorded_at)
     
-    history = query.order_by(PriceHistory.recorded_at.desc()).limit(limit).all()
+    return _export_response(stmt, format, f"price_history_{product_id}")
+
+router_export = APIRouter(prefix="/history", tags=["history"])
+
+@router_export.get("/export")
+async def export_all_price_history(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    stmt = _export_select(Product.id, start_date, end_date).join(
+        Product, Product.catalog_item_id == PriceHistory.catalog_item_id
+    ).where(
+        Product.user_id == current_user.id
+    ).order_by(Product.id, PriceHistory.recorded_at)
     
-    return history
+    return _export_response(stmt, format, "price_history")
@@ -1,58 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Header
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy import func, select
+from typing import List, Optional
 from datetime import datetime
 from app.database import get_db
-from app.middleware.auth_middleware import get_current_user
+from app.middleware.auth_middleware import get_current_user, get_user_read_db
 from app.models.user import User
 from app.models.product import Product
 from app.models.price_alert import PriceAlert
-from app.models.price_history import PriceHistory
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductWithAlerts
-from app.services.scraper_service import scraper_service
+from app.models.catalog_item import CatalogItem
+from app.schemas.product import (
+    ProductCreate, ProductUpdate, ProductResponse, ProductWithAlerts,
+    ProductImportRequest, ProductImportResponse
+)
+from app.services.import_service import import_service
+from app.services.cache_service import response_cache, make_etag
+from app.services.serializer import dumps_rows
+from app.services.sparkline import unpack_points
+from app.services.catalog_service import catalog_service
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+PRODUCT_COLUMNS = tuple(
+    (Product.__table__.c[name] if name in Product.__table__.c else CatalogItem.__table__.c[name]).label(name)
+    for name in ProductResponse.model_fields
+)
+PRODUCT_LIST_FIELDS = tuple(ProductWithAlerts.model_fields)
+
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_data: ProductCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    scraped_data = None
-    use_manual = False
+    item = catalog_service.find(db, product_data.url)
     
-    try:
-        scraped_data = scraper_service.scrape_product(product_data.url)
-    except Exception as e:
-        if product_data.manual_price is not None:
-            use_manual = True
-            scraped_data = {
-                'price': product_data.manual_price,
-                'name': product_data.manual_name or 'Product',
-                'currency': product_data.manual_currency or 'USD',
-                'image_url': None
-            }
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to scrape product: {str(e)}. Please provide manual_price, manual_name, and manual_currency as fallback."
+    # Items already in the catalog are kept fresh by the price checker, so
+    # only the first subscriber to a URL pays for a scrape
+    if item is None or item.current_price is None:
+        from app.services.scraper_client import get_scraper
+        
+        use_manual = False
+        try:
+            scraped_data = get_scraper().scrape_product(product_data.url)
+        except Exception as e:
+            if product_data.manual_price is not None:
+                use_manual = True
+                scraped_data = {
+                    'price': product_data.manual_price,
+                    'name': product_data.manual_name or 'Product',
+                    'currency': product_data.manual_currency or 'USD',
+                    'image_url': None
+                }
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Failed to scrape product: {str(e)}. Please provide manual_price, manual_name, and manual_currency as fallback."
+                )
+        
+        if item is None:
+            item = catalog_service.get_or_create(
+                db, product_data.url, scraped_data, checked_at=None if use_manual else datetime.utcnow()
             )
+        else:
+            catalog_service.record_price(db, item, scraped_data['price'], datetime.utcnow())
+            if use_manual:
+                item.last_checked_at = None
+    
+    existing = db.query(Product.id).filter(
+        Product.user_id == current_user.id,
+        Product.catalog_item_id == item.id
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"You are already tracking this product (id {existing.id})"
+        )
     
     product = Product(
         user_id=current_user.id,
-        url=product_data.url,
-        name=scraped_data['name'],
-        current_price=scraped_data['price'],
-        currency=scraped_data['currency'],
-        image_url=scraped_data['image_url'],
-        check_interval_minutes=product_data.check_interval_minutes,
-        last_checked_at=datetime.utcnow() if not use_manual else None
+        catalog_item_id=item.id,
+        check_interval_minutes=product_data.check_interval_minutes
     )
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    db.flush()
     
     alert = PriceAlert(
         product_id=product.id,
@@ -60,39 +92,89 @@ async def create_product(
     )
     db.add(alert)
     
-    history = PriceHistory(
-        product_id=product.id,
-        price=scraped_data['price'],
-        recorded_at=datetime.utcnow()
-    )
-    db.add(history)
-    
     db.commit()
     db.refresh(product)
+    response_cache.invalidate_user(current_user.id)
     
     return product
 
+async def _run_import(db: Session, user_id: int, rows: list) -> ProductImportResponse:
+    try:
+        results = await run_in_threadpool(import_service.import_products, db, user_id, rows)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    created = sum(1 for result in results if result.status == 'created')
+    if created:
+        response_cache.invalidate_user(user_id)
+    return ProductImportResponse(created=created, failed=len(results) - created, results=results)
+
+@router.post("/import", response_model=ProductImportResponse)
+async def import_products(
+    import_data: ProductImportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await _run_import(db, current_user.id, import_data.items)
+
+@router.post("/import/csv", response_model=ProductImportResponse)
+async def import_products_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        rows = import_service.parse_csv(await file.read())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV file: {str(e)}"
+        )
+    
+    return await _run_import(db, current_user.id, rows)
+
 @router.get("", response_model=List[ProductWithAlerts])
 async def get_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_user_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    products = db.query(Product).filter(Product.user_id == current_user.id).offset(skip).limit(limit).all()
-    
-    result = []
-    for product in products:
-        alert_count = db.query(func.count(PriceAlert.id)).filter(
-            PriceAlert.product_id == product.id,
+    def compute_etag() -> str:
+        count, last_updated, last_priced = db.query(
+            func.count(Product.id), func.max(Product.updated_at), func.max(CatalogItem.updated_at)
+        ).join(CatalogItem).filter(
+            Product.user_id == current_user.id
+        ).one()
+        active_alerts = db.query(func.count(PriceAlert.id)).join(Product).filter(
+            Product.user_id == current_user.id,
             PriceAlert.is_active == True
         ).scalar()
+        return make_etag("products", current_user.id, skip, limit, count, last_updated, last_priced, active_alerts)
+    
+    def build_body() -> bytes:
+        alert_count = select(func.count(PriceAlert.id)).where(
+            PriceAlert.product_id == Product.id,
+            PriceAlert.is_active == True
+        ).correlate(Product).scalar_subquery().label("alert_count")
         
-        product_dict = ProductWithAlerts.model_validate(product)
-        product_dict.alert_count = alert_count
-        result.append(product_dict)
+        rows = db.execute(
+            select(*PRODUCT_COLUMNS, alert_count, CatalogItem.recent_prices).join(
+                CatalogItem, CatalogItem.id == Product.catalog_item_id
+            ).where(
+                Product.user_id == current_user.id
+            ).order_by(Product.id).offset(skip).limit(limit)
+        ).all()
+        
+        return dumps_rows(PRODUCT_LIST_FIELDS, ((*row[:-1], unpack_points(row[-1])) for row in rows))
     
-    return result
+    return response_cache.conditional_response(
+        current_user.id, f"products:{skip}:{limit}", if_none_match, compute_etag, build_body
+    )
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
@@ -139,6 +221,7 @@ async def update_product(
     product.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(product)
+    response_cache.invalidate_user(current_user.id)
     
     return product
 
@@ -161,5 +244,6 @@ async def delete_product(
     
     db.delete(product)
     db.commit()
+    response_cache.invalidate_user(current_user.id)
     
     return None
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.middleware.auth_middleware import get_current_user, get_user_read_db
+from app.models.user import User
+from app.models.product import Product
+from app.models.price_history import PriceHistory
+from app.schemas.stats import ProductPriceStats
+from app.services.cache_service import response_cache, make_etag
+from app.services.serializer import dumps
+
+router = APIRouter(prefix="/products", tags=["stats"])
+
+def _history_etag(db: Session, field: str, products: List[Product]) -> str:
+    count, latest = db.query(func.count(PriceHistory.id), func.max(PriceHistory.recorded_at)).filter(
+        PriceHistory.catalog_item_id.in_({product.catalog_item_id for product in products})
+    ).one()
+    return make_etag(field, len(products), count, latest, *(product.current_price for product in products))
+
+@router.get("/stats", response_model=List[ProductPriceStats])
+async def get_all_price_stats(
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    from app.services.stats_service import stats_service
+    
+    products = db.query(Product).filter(Product.user_id == current_user.id).all()
+    
+    return response_cache.conditional_response(
+        current_user.id,
+        "stats:all",
+        if_none_match,
+        lambda: _history_etag(db, "stats:all", products),
+        lambda: dumps(stats_service.for_products(db, products))
+    )
+
+@router.get("/{product_id}/stats", response_model=ProductPriceStats)
+async def get_price_stats(
+    product_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    product = db.query(Product).filter(
+        Product.id == product_id,
+        Product.user_id == current_user.id
+    ).first()
+    
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    from app.services.stats_service import stats_service
+    
+    field = f"stats:{product_id}"
+    return response_cache.conditional_response(
+        current_user.id,
+        field,
+        if_none_match,
+        lambda: _history_etag(db, field, [product]),
+        lambda: dumps(stats_service.for_products(db, [product])[0])
+    )
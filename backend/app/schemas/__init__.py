@@ -1,9 +1,19 @@
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductWithAlerts
+from app.schemas.product import (
+    ProductCreate, ProductUpdate, ProductResponse, ProductWithAlerts, SparklinePoint,
+    ProductImportRequest, ProductImportRowResult, ProductImportResponse
+)
 from app.schemas.alert import AlertCreate, AlertUpdate, AlertResponse, PriceHistoryResponse
+from app.schemas.stats import PriceStatsWindow, ProductPriceStats
+from app.schemas.dashboard import DashboardProductSummary, DashboardSummary
+from app.schemas.scrape import ScrapeBatchRequest, ScrapeResult, ScrapeBatchResponse
 
 __all__ = [
     "UserCreate", "UserResponse",
-    "ProductCreate", "ProductUpdate", "ProductResponse", "ProductWithAlerts",
-    "AlertCreate", "AlertUpdate", "AlertResponse", "PriceHistoryResponse"
+    "ProductCreate", "ProductUpdate", "ProductResponse", "ProductWithAlerts", "SparklinePoint",
+    "ProductImportRequest", "ProductImportRowResult", "ProductImportResponse",
+    "AlertCreate", "AlertUpdate", "AlertResponse", "PriceHistoryResponse",
+    "PriceStatsWindow", "ProductPriceStats",
+    "DashboardProductSummary", "DashboardSummary",
+    "ScrapeBatchRequest", "ScrapeResult", "ScrapeBatchResponse"
 ]
@@ -1,33 +1,65 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 from decimal import Decimal
 
+AlertType = Literal['target_price', 'percent_drop', 'all_time_low', 'drop_since_last_check']
+
 class AlertCreate(BaseModel):
-    target_price: Decimal
+    alert_type: AlertType = 'target_price'
+    target_price: Optional[Decimal] = None
+    threshold_percent: Optional[Decimal] = None
+    baseline_price: Optional[Decimal] = None
     
-    @field_validator('target_price')
+    @field_validator('target_price', 'baseline_price')
     @classmethod
     def validate_price(cls, v):
-        if v <= 0:
-            raise ValueError('Target price must be positive')
+        if v is not None and v <= 0:
+            raise ValueError('Price must be positive')
         return v
+    
+    @field_validator('threshold_percent')
+    @classmethod
+    def validate_percent(cls, v):
+        if v is not None and not 0 < v < 100:
+            raise ValueError('Threshold percent must be between 0 and 100')
+        return v
+    
+    @model_validator(mode='after')
+    def validate_alert_type(self):
+        if self.alert_type == 'target_price' and self.target_price is None:
+            raise ValueError('target_price is required for target_price alerts')
+        if self.alert_type == 'percent_drop' and self.threshold_percent is None:
+            raise ValueError('threshold_percent is required for percent_drop alerts')
+        return self
 
 class AlertUpdate(BaseModel):
     target_price: Optional[Decimal] = None
+    threshold_percent: Optional[Decimal] = None
+    baseline_price: Optional[Decimal] = None
     is_active: Optional[bool] = None
     
-    @field_validator('target_price')
+    @field_validator('target_price', 'baseline_price')
     @classmethod
     def validate_price(cls, v):
         if v is not None and v <= 0:
-            raise ValueError('Target price must be positive')
+            raise ValueError('Price must be positive')
+        return v
+    
+    @field_validator('threshold_percent')
+    @classmethod
+    def validate_percent(cls, v):
+        if v is not None and not 0 < v < 100:
+            raise ValueError('Threshold percent must be between 0 and 100')
         return v
 
 class AlertResponse(BaseModel):
     id: int
     product_id: int
+    alert_type: str
     target_price: Decimal
+    threshold_percent: Optional[Decimal] = None
+    baseline_price: Optional[Decimal] = None
     is_active: bool
     triggered_at: Optional[datetime]
     created_at: datetime
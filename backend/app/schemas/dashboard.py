@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+from decimal import Decimal
+from app.schemas.product import SparklinePoint
+
+class DashboardProductSummary(BaseModel):
+    id: int
+    name: Optional[str]
+    url: str
+    image_url: Optional[str]
+    currency: Optional[str]
+    is_active: bool
+    current_price: Optional[Decimal]
+    lowest_price: Optional[Decimal] = None
+    lowest_price_at: Optional[datetime] = None
+    previous_price: Optional[Decimal] = None
+    last_changed_at: Optional[datetime] = None
+    change_percent: Optional[float] = None
+    active_alerts: int = 0
+    triggered_alerts: int = 0
+    lowest_target_price: Optional[Decimal] = None
+    last_triggered_at: Optional[datetime] = None
+    sparkline: List[SparklinePoint] = []
+
+class DashboardSummary(BaseModel):
+    product_count: int
+    active_alert_count: int
+    triggered_alert_count: int
+    products: List[DashboardProductSummary]
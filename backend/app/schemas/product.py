@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any
 from decimal import Decimal
 
 class ProductCreate(BaseModel):
@@ -60,5 +60,26 @@ class ProductResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SparklinePoint(BaseModel):
+    price: Decimal
+    recorded_at: datetime
+
 class ProductWithAlerts(ProductResponse):
     alert_count: int = 0
+    sparkline: List[SparklinePoint] = []
+
+class ProductImportRequest(BaseModel):
+    items: List[Dict[str, Any]]
+
+class ProductImportRowResult(BaseModel):
+    row: int
+    url: Optional[str]
+    status: str
+    product_id: Optional[int] = None
+    used_manual: bool = False
+    error: Optional[str] = None
+
+class ProductImportResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ProductImportRowResult]
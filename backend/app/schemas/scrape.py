@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from decimal import Decimal
+
+class ScrapeBatchRequest(BaseModel):
+    urls: List[str]
+
+class ScrapeResult(BaseModel):
+    url: str
+    price: Optional[Decimal] = None
+    name: Optional[str] = None
+    image_url: Optional[str] = None
+    currency: Optional[str] = None
+    error: Optional[str] = None
+
+class ScrapeBatchResponse(BaseModel):
+    results: List[ScrapeResult]
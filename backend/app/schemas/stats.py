@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from decimal import Decimal
+
+class PriceStatsWindow(BaseModel):
+    window: str
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    p10: Optional[float] = None
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    current_percentile_rank: Optional[float] = None
+    drop_percent: Optional[float] = None
+
+class ProductPriceStats(BaseModel):
+    product_id: int
+    current_price: Optional[Decimal]
+    currency: Optional[str]
+    windows: List[PriceStatsWindow]
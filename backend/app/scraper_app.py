@@ -0,0 +1,64 @@
+"""Standalone scraping service.
+
+Runs the HTML stack, connection pool, parse pool and result cache in one
+process so the API and Celery workers can reach it over HTTP through
+app.services.scraper_client instead of scraping in-process.
+
+Usage: uvicorn app.scraper_app:app --host 0.0.0.0 --port 8001
+"""
+import secrets
+from typing import Optional
+from fastapi import FastAPI, Depends, Header, HTTPException, status
+from app.config import settings
+from app.middleware.metrics_auth import require_metrics_token
+from app.schemas.scrape import ScrapeBatchRequest, ScrapeBatchResponse, ScrapeResult
+from app.services.batch_scraper import batch_scraper
+from app.services.metrics_service import metrics
+from app.services.parse_pool import parse_pool
+from app.services.serializer import ProfiledORJSONResponse
+
+app = FastAPI(
+    title="Price Drop Scraper",
+    description="Batch product page scraping",
+    version="1.0.0",
+    default_response_class=ProfiledORJSONResponse
+)
+
+@app.on_event("startup")
+def start_parse_pool():
+    if settings.SCRAPER_PARSE_POOL_ENABLED:
+        parse_pool.enable()
+
+@app.on_event("shutdown")
+def stop_parse_pool():
+    parse_pool.shutdown()
+
+@app.post("/scrape", response_model=ScrapeBatchResponse)
+def scrape(batch: ScrapeBatchRequest, x_scraper_token: Optional[str] = Header(None)):
+    if settings.SCRAPER_SERVICE_TOKEN and not secrets.compare_digest(
+        x_scraper_token or "", settings.SCRAPER_SERVICE_TOKEN
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid scraper token")
+    if len(batch.urls) > settings.SCRAPER_BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SCRAPER_BATCH_MAX_URLS} URLs per batch"
+        )
+
+    metrics.increment('scraper_batch_urls_total', len(batch.urls))
+    results = []
+    for url, (data, error) in zip(batch.urls, batch_scraper.scrape_many(batch.urls)):
+        results.append(ScrapeResult(url=url, error=error, **(data or {})))
+    return ScrapeBatchResponse(results=results)
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    return metrics.snapshot()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,93 @@
+from decimal import Decimal, ROUND_DOWN
+from typing import List, Optional
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.price_alert import (
+    PriceAlert, ALERT_TYPE_TARGET_PRICE, ALERT_TYPE_PERCENT_DROP,
+    ALERT_TYPE_ALL_TIME_LOW, ALERT_TYPE_DROP_SINCE_LAST_CHECK
+)
+from app.models.price_history import PriceHistory
+from app.models.price_history_rollup import PriceHistoryRollup
+
+PRICE_STEP = Decimal('0.01')
+
+# Fields a client sets per alert type; the others are derived by apply_threshold
+THRESHOLD_FIELDS = {
+    ALERT_TYPE_TARGET_PRICE: {'target_price'},
+    ALERT_TYPE_PERCENT_DROP: {'threshold_percent', 'baseline_price'},
+    ALERT_TYPE_ALL_TIME_LOW: set(),
+    ALERT_TYPE_DROP_SINCE_LAST_CHECK: set(),
+}
+
+
+class AlertService:
+    """Turns every alert type into one comparable trigger price.
+
+    `target_price` always holds the highest price that fires the alert, so a
+    price check is a single indexed range lookup over the product's pending
+    alerts rather than type-specific arithmetic per alert.
+    """
+
+    def lowest_recorded_price(self, db: Session, catalog_item_id: int) -> Optional[Decimal]:
+        live = db.execute(
+            select(func.min(PriceHistory.price)).where(PriceHistory.catalog_item_id == catalog_item_id)
+        ).scalar()
+        archived = db.execute(
+            select(func.min(PriceHistoryRollup.min_price)).where(PriceHistoryRollup.catalog_item_id == catalog_item_id)
+        ).scalar()
+        prices = [price for price in (live, archived) if price is not None]
+        return min(prices) if prices else None
+
+    def apply_threshold(self, db: Session, alert: PriceAlert, product: Product):
+        """Recompute alert.target_price from its type and the product's current state."""
+        if alert.alert_type == ALERT_TYPE_TARGET_PRICE:
+            return
+
+        if alert.alert_type == ALERT_TYPE_PERCENT_DROP:
+            if alert.baseline_price is None:
+                alert.baseline_price = product.current_price
+            if alert.baseline_price is None:
+                raise ValueError("baseline_price is required until the product has a current price")
+            ratio = (Decimal(100) - alert.threshold_percent) / Decimal(100)
+            alert.target_price = (alert.baseline_price * ratio).quantize(PRICE_STEP, rounding=ROUND_DOWN)
+            return
+
+        if alert.alert_type == ALERT_TYPE_ALL_TIME_LOW:
+            prices = [self.lowest_recorded_price(db, product.catalog_item_id), product.current_price]
+            reference = min((price for price in prices if price is not None), default=None)
+        elif alert.alert_type == ALERT_TYPE_DROP_SINCE_LAST_CHECK:
+            reference = product.current_price
+        else:
+            raise ValueError(f"Unknown alert type: {alert.alert_type}")
+
+        if reference is None:
+            raise ValueError("The product has no recorded price to compare against yet")
+
+        alert.target_price = max(reference - PRICE_STEP, Decimal(0))
+
+    def pending_triggered(self, db: Session, catalog_item_id: int, price: Decimal) -> List[PriceAlert]:
+        """Pending alerts of active subscriptions to the item that `price` fires."""
+        return db.query(PriceAlert).join(Product).filter(
+            Product.catalog_item_id == catalog_item_id,
+            Product.is_active == True,
+            PriceAlert.is_active == True,
+            PriceAlert.triggered_at.is_(None),
+            PriceAlert.target_price >= price
+        ).order_by(PriceAlert.target_price.desc()).all()
+
+    def relevel_after_check(self, db: Session, catalog_item_id: int, price: Decimal):
+        """Move drop-since-last-check alerts that did not fire just below the new price."""
+        db.execute(
+            update(PriceAlert).where(
+                PriceAlert.product_id.in_(
+                    select(Product.id).where(Product.catalog_item_id == catalog_item_id)
+                ),
+                PriceAlert.alert_type == ALERT_TYPE_DROP_SINCE_LAST_CHECK,
+                PriceAlert.is_active == True,
+                PriceAlert.triggered_at.is_(None),
+                PriceAlert.target_price < price
+            ).values(target_price=price - PRICE_STEP).execution_options(synchronize_session=False)
+        )
+
+alert_service = AlertService()
@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.models.user import User
 
+EVENT_TICKET_SCOPE = "events"
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -15,6 +17,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+def create_event_ticket(user_id: int) -> str:
+    """A short-lived token that only opens the event stream, safe to put in a URL."""
+    return create_access_token(
+        data={"user_id": user_id, "scope": EVENT_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=settings.EVENTS_TICKET_TTL_SECONDS)
+    )
+
 def verify_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from app.config import settings
+from app.services.metrics_service import metrics
+from app.services.scraper_service import scraper_service
+
+ScrapeResult = Tuple[Optional[Dict], Optional[str]]
+
+
+class BatchScraper:
+    """Scrapes many URLs at once on a shared thread pool, with per-host limits and a short result cache.
+
+    One pool serves every caller in the process, so concurrent batches share
+    the overall concurrency and the scraper's connection pool. Each host gets
+    at most `per_host` requests in flight, and batches are queued
+    round-robin across hosts so one large shop does not hold every thread.
+    Successful results are cached for `cache_seconds`, which absorbs the
+    same URL arriving from several users or imports at once.
+    """
+
+    def __init__(self, scrape: Callable[[str], Dict], concurrency: int, per_host: int,
+                 cache_seconds: int, cache_size: int):
+        self.scrape = scrape
+        self.per_host = per_host
+        self.cache_seconds = cache_seconds
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scrape")
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def _cached(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires < time.monotonic():
+                del self._cache[url]
+                return None
+            self._cache.move_to_end(url)
+            return data
+
+    def _store(self, url: str, data: Dict):
+        if self.cache_seconds <= 0:
+            return
+        with self._lock:
+            self._cache[url] = (time.monotonic() + self.cache_seconds, data)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _scrape_one(self, url: str) -> ScrapeResult:
+        data = self._cached(url)
+        if data is not None:
+            metrics.increment('scraper_result_cache_total', labels={'result': 'hit'})
+            return data, None
+        metrics.increment('scraper_result_cache_total', labels={'result': 'miss'})
+
+        with self._host_slot(urlsplit(url).hostname or ''):
+            try:
+                data = self.scrape(url)
+            except Exception as e:
+                return None, str(e)
+        self._store(url, data)
+        return data, None
+
+    def scrape_many(self, urls: List[str]) -> List[ScrapeResult]:
+        """(scraped fields, error message) for each URL, in the order given."""
+        unique_urls = list(dict.fromkeys(urls))
+        by_host: Dict[str, List[str]] = {}
+        for url in unique_urls:
+            by_host.setdefault(urlsplit(url).hostname or '', []).append(url)
+        ordered = [url for url in chain.from_iterable(zip_longest(*by_host.values())) if url is not None]
+
+        results = dict(zip(ordered, self.executor.map(self._scrape_one, ordered)))
+        return [results[url] for url in urls]
+
+    def scrape_product(self, url: str) -> Dict:
+        data, error = self._scrape_one(url)
+        if error is not None:
+            raise Exception(error)
+        return data
+
+batch_scraper = BatchScraper(
+    scraper_service.scrape_product,
+    settings.SCRAPER_CONCURRENCY,
+    settings.SCRAPER_PER_HOST_LIMIT,
+    settings.SCRAPER_RESULT_CACHE_SECONDS,
+    settings.SCRAPER_RESULT_CACHE_SIZE
+)
@@ -0,0 +1,144 @@
+import hashlib
+from typing import Optional, Callable, Iterable, Tuple
+import redis
+from starlette.responses import Response
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Per-user hash of serialized responses keyed by route, dropped on every write."""
+
+    KEY_PREFIX = "cache:user:"
+    # Set on invalidation and kept for the replica lag window, during which
+    # the user's reads go to the primary so a lagging replica cannot refill
+    # the cache with the state from before the write
+    WROTE_PREFIX = "cache:wrote:"
+    WROTE_ALL = "cache:wrote:all"
+
+    def __init__(self):
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+        self.track_writes = settings.DATABASE_REPLICA_URL is not None
+        self.write_grace = settings.REPLICA_LAG_GRACE_SECONDS
+        self._client = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5
+            )
+        return self._client
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+
+    def get(self, user_id: int, field: str) -> Optional[Tuple[str, bytes]]:
+        if not self.enabled:
+            return None
+        try:
+            cached = self.client.hget(self._key(user_id), field)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            return None
+        if cached is None:
+            return None
+        etag, _, body = cached.partition(b'\n')
+        return etag.decode(), body
+
+    def set(self, user_id: int, field: str, etag: str, body: bytes):
+        if not self.enabled:
+            return
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(self._key(user_id), field, etag.encode() + b'\n' + body)
+            pipe.expire(self._key(user_id), self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def invalidate_users(self, user_ids: Iterable[int]):
+        user_ids = set(user_ids)
+        if not user_ids or not (self.enabled or self.track_writes):
+            return
+        try:
+            pipe = self.client.pipeline()
+            if self.enabled:
+                pipe.delete(*(self._key(user_id) for user_id in user_ids))
+            if self.track_writes:
+                for user_id in user_ids:
+                    pipe.set(f"{self.WROTE_PREFIX}{user_id}", 1, ex=self.write_grace)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Response cache invalidation failed: {str(e)}")
+
+    def invalidate_user(self, user_id: int):
+        self.invalidate_users([user_id])
+
+    def invalidate_all(self):
+        try:
+            if self.track_writes:
+                self.client.set(self.WROTE_ALL, 1, ex=self.write_grace)
+            if not self.enabled:
+                return
+            keys = list(self.client.scan_iter(match=f"{self.KEY_PREFIX}*", count=1000))
+            for start in range(0, len(keys), 1000):
+                self.client.delete(*keys[start:start + 1000])
+        except redis.RedisError as e:
+            logger.warning(f"Response cache invalidation failed: {str(e)}")
+
+    def recently_wrote(self, user_id: int) -> bool:
+        """Whether the user's data changed within the replica lag window; unknown counts as yes."""
+        if not self.track_writes:
+            return False
+        try:
+            return any(self.client.mget(f"{self.WROTE_PREFIX}{user_id}", self.WROTE_ALL))
+        except redis.RedisError as e:
+            logger.warning(f"Write marker read failed: {str(e)}")
+            return True
+
+    def conditional_response(
+        self,
+        user_id: int,
+        field: str,
+        if_none_match: Optional[str],
+        compute_etag: Callable[[], str],
+        build_body: Callable[[], bytes]
+    ) -> Response:
+        """Answer from the cache or a freshly computed ETag before building the body."""
+        cached = self.get(user_id, field)
+        etag = cached[0] if cached else compute_etag()
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        if cached:
+            body = cached[1]
+        else:
+            body = build_body()
+            self.set(user_id, field, etag, body)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+response_cache = ResponseCache()
@@ -0,0 +1,105 @@
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.price_history import PriceHistory
+from app.services.sparkline import pack_points, append_point
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_', 'psc', 'smid', 'spm'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalise a product URL so the same page tracked by different users maps to one catalog item.
+
+    Scheme and host are lowercased, default ports, fragments, tracking query
+    parameters and trailing slashes are dropped and the remaining query
+    parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_hash(canonical_url: str) -> str:
+    return hashlib.sha256(canonical_url.encode('utf-8')).hexdigest()
+
+
+class CatalogService:
+    """Owns the shared catalog: one item, one history stream and one scrape per canonical URL."""
+
+    def find(self, db: Session, url: str) -> Optional[CatalogItem]:
+        return db.query(CatalogItem).filter(
+            CatalogItem.url_hash == url_hash(canonicalize_url(url))
+        ).first()
+
+    def find_many(self, db: Session, urls: Iterable[str]) -> Dict[str, CatalogItem]:
+        """Map each canonical URL to its existing catalog item."""
+        hashes = {url_hash(canonicalize_url(url)): canonicalize_url(url) for url in urls}
+        if not hashes:
+            return {}
+        items = db.query(CatalogItem).filter(CatalogItem.url_hash.in_(list(hashes))).all()
+        return {hashes[item.url_hash]: item for item in items}
+
+    def build(self, url: str, scraped_data: Dict, checked_at: Optional[datetime], now: datetime) -> CatalogItem:
+        canonical = canonicalize_url(url)
+        item = CatalogItem(
+            url=canonical,
+            url_hash=url_hash(canonical),
+            name=scraped_data['name'],
+            current_price=scraped_data['price'],
+            currency=scraped_data['currency'],
+            image_url=scraped_data['image_url'],
+            last_checked_at=checked_at,
+            recent_prices=pack_points([(now, scraped_data['price'])])
+        )
+        item.price_history.append(PriceHistory(price=scraped_data['price'], recorded_at=now))
+        return item
+
+    def get_or_create(self, db: Session, url: str, scraped_data: Dict, checked_at: Optional[datetime] = None) -> CatalogItem:
+        """Return the catalog item for `url`, creating it with its first price point if needed.
+
+        Commits the new item so a concurrent request for the same URL resolves
+        to it through the unique hash instead of creating a duplicate.
+        """
+        item = self.find(db, url)
+        if item is not None:
+            return item
+
+        item = self.build(url, scraped_data, checked_at, datetime.utcnow())
+        db.add(item)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            item = self.find(db, url)
+            if item is None:
+                raise
+        return item
+
+    def record_price(self, db: Session, item: CatalogItem, price: Decimal, now: datetime) -> bool:
+        """Store a checked price on the item, adding a history point when it changed."""
+        item.last_checked_at = now
+        if price == item.current_price:
+            return False
+
+        db.add(PriceHistory(catalog_item_id=item.id, price=price, recorded_at=now))
+        item.current_price = price
+        item.recent_prices = append_point(item.recent_prices, price, now, settings.SPARKLINE_POINTS)
+        return True
+
+catalog_service = CatalogService()
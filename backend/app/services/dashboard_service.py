@@ -0,0 +1,109 @@
+from typing import Dict
+from sqlalchemy import select, func, case, and_
+from sqlalchemy.orm import Session
+from app.models.catalog_item import CatalogItem
+from app.models.product import Product
+from app.models.price_alert import PriceAlert
+from app.models.price_history import PriceHistory
+from app.services.sparkline import unpack_points
+
+
+class DashboardService:
+    """Builds the dashboard summary for a user in a fixed number of aggregate queries."""
+
+    def _history_rows(self, db: Session, user_id: int):
+        ranked = select(
+            Product.id.label('product_id'),
+            PriceHistory.price,
+            PriceHistory.recorded_at,
+            func.row_number().over(
+                partition_by=PriceHistory.catalog_item_id,
+                order_by=(PriceHistory.price.asc(), PriceHistory.recorded_at.desc())
+            ).label('low_rank'),
+        ).join(Product, Product.catalog_item_id == PriceHistory.catalog_item_id).where(
+            Product.user_id == user_id
+        ).subquery()
+
+        return db.execute(select(ranked).where(ranked.c.low_rank == 1)).all()
+
+    def _alert_rows(self, db: Session, user_id: int):
+        pending = and_(PriceAlert.is_active == True, PriceAlert.triggered_at.is_(None))
+        return db.execute(
+            select(
+                PriceAlert.product_id,
+                func.sum(case((PriceAlert.is_active == True, 1), else_=0)).label('active_alerts'),
+                func.sum(case((PriceAlert.triggered_at.isnot(None), 1), else_=0)).label('triggered_alerts'),
+                func.min(case((pending, PriceAlert.target_price))).label('lowest_target_price'),
+                func.max(PriceAlert.triggered_at).label('last_triggered_at'),
+            ).join(Product, Product.id == PriceAlert.product_id).where(
+                Product.user_id == user_id
+            ).group_by(PriceAlert.product_id)
+        ).all()
+
+    def summary(self, db: Session, user_id: int) -> Dict:
+        products = db.execute(
+            select(
+                Product.id, CatalogItem.name, CatalogItem.url, CatalogItem.image_url,
+                CatalogItem.currency, Product.is_active, CatalogItem.current_price, CatalogItem.recent_prices
+            ).join(CatalogItem, CatalogItem.id == Product.catalog_item_id).where(
+                Product.user_id == user_id
+            ).order_by(Product.id)
+        ).all()
+
+        summaries = {}
+        for row in products:
+            summary = row._asdict()
+            sparkline = unpack_points(summary.pop('recent_prices'))
+            summaries[row.id] = {
+                **summary,
+                'lowest_price': None,
+                'lowest_price_at': None,
+                'previous_price': None,
+                'last_changed_at': None,
+                'change_percent': None,
+                'active_alerts': 0,
+                'triggered_alerts': 0,
+                'lowest_target_price': None,
+                'last_triggered_at': None,
+                'sparkline': sparkline,
+            }
+
+        for row in self._history_rows(db, user_id):
+            summary = summaries.get(row.product_id)
+            if summary is None:
+                continue
+            summary['lowest_price'] = row.price
+            summary['lowest_price_at'] = row.recorded_at
+
+        for summary in summaries.values():
+            sparkline = summary['sparkline']
+            if len(sparkline) >= 2:
+                previous, latest = sparkline[-2], sparkline[-1]
+                summary['previous_price'] = previous['price']
+                summary['last_changed_at'] = latest['recorded_at']
+                if previous['price']:
+                    summary['change_percent'] = round(
+                        float((latest['price'] - previous['price']) * 100 / previous['price']), 2
+                    )
+
+        active_total = 0
+        triggered_total = 0
+        for row in self._alert_rows(db, user_id):
+            summary = summaries.get(row.product_id)
+            if summary is None:
+                continue
+            summary['active_alerts'] = int(row.active_alerts or 0)
+            summary['triggered_alerts'] = int(row.triggered_alerts or 0)
+            summary['lowest_target_price'] = row.lowest_target_price
+            summary['last_triggered_at'] = row.last_triggered_at
+            active_total += summary['active_alerts']
+            triggered_total += summary['triggered_alerts']
+
+        return {
+            'product_count': len(summaries),
+            'active_alert_count': active_total,
+            'triggered_alert_count': triggered_total,
+            'products': list(summaries.values()),
+        }
+
+dashboard_service = DashboardService()
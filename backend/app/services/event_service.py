@@ -0,0 +1,100 @@
+import asyncio
+import json
+from typing import Dict, Set, List, Tuple, Optional
+import redis
+import redis.asyncio as aioredis
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "events:user:"
+
+
+class EventPublisher:
+    """Publishes per-user events from workers over Redis pub/sub."""
+
+    def __init__(self):
+        self.enabled = settings.EVENTS_ENABLED
+        self._client = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1)
+        return self._client
+
+    def publish_many(self, events: List[Tuple[int, Dict]]):
+        if not self.enabled or not events:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for user_id, event in events:
+                pipe.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(event, default=str))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish {len(events)} events: {str(e)}")
+
+
+class EventHub:
+    """Fans Redis pub/sub messages out to the SSE connections held by this process.
+
+    A single pattern subscription serves every connection, so an idle client
+    costs one small asyncio queue rather than a Redis connection.
+    """
+
+    def __init__(self):
+        self.queue_size = settings.EVENTS_QUEUE_SIZE
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self.subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[user_id]
+
+    def _dispatch(self, channel: bytes, data: bytes):
+        try:
+            user_id = int(channel.decode()[len(CHANNEL_PREFIX):])
+        except ValueError:
+            return
+        for queue in self.subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping event for slow subscriber of user {user_id}")
+
+    async def _listen(self):
+        backoff = 1
+        while True:
+            client = aioredis.Redis.from_url(settings.REDIS_URL)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                backoff = 1
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                    if message and message['type'] == 'pmessage':
+                        self._dispatch(message['channel'], message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event listener disconnected, retrying in {backoff}s: {str(e)}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+event_publisher = EventPublisher()
+event_hub = EventHub()
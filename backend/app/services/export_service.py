@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from typing import Iterator
+from sqlalchemy import Select
+from app.database import ReadSessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_COLUMNS = ['id', 'product_id', 'price', 'recorded_at']
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _format_ndjson(rows) -> str:
+    return ''.join(
+        json.dumps({
+            'id': row_id,
+            'product_id': product_id,
+            'price': str(price),
+            'recorded_at': recorded_at.isoformat(),
+        }) + '\n'
+        for row_id, product_id, price, recorded_at in rows
+    )
+
+
+def _format_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row_id, product_id, price, recorded_at in rows:
+        writer.writerow([row_id, product_id, price, recorded_at.isoformat()])
+    return buffer.getvalue()
+
+
+def stream_history(stmt: Select, fmt: str) -> Iterator[str]:
+    """Yield formatted chunks of a price history select using a server-side cursor.
+
+    The export owns its session because the request-scoped one is closed
+    before a streaming body is sent.
+    """
+    formatter = _format_csv if fmt == 'csv' else _format_ndjson
+    db = ReadSessionLocal()
+    try:
+        if fmt == 'csv':
+            yield ','.join(EXPORT_COLUMNS) + '\r\n'
+
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE))
+        for rows in result.partitions():
+            yield formatter(rows)
+    except Exception as e:
+        logger.error(f"Price history export failed: {str(e)}")
+        raise
+    finally:
+        db.close()
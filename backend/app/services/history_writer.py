@@ -0,0 +1,208 @@
+import os
+import socket
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+import redis
+from sqlalchemy import update, insert, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.price_history import PriceHistory
+from app.models.product import Product
+from app.services.metrics_service import metrics
+from app.services.sparkline import append_point
+import logging
+
+logger = logging.getLogger(__name__)
+
+GROUP = "history-writer"
+LAST_PRICE_PREFIX = "history:last_price:"
+# Outlives any writer backlog; after it the catalog row is authoritative again
+LAST_PRICE_TTL_SECONDS = 24 * 3600
+
+# (catalog item id, checked price, checked at)
+Observation = Tuple[int, Decimal, datetime]
+
+
+class HistoryWriter:
+    """Write-behind buffer for price observations, backed by a Redis stream and consumer group.
+
+    Checkers append observations instead of updating catalog items and
+    history themselves; the writer reads them in large batches, folds every
+    observation of an item into one row update plus its history points, and
+    commits each batch in a single transaction. Entries are acknowledged and
+    deleted only after the commit, and entries left pending by a writer that
+    died are reclaimed once idle, so delivery is at-least-once. Redelivered
+    observations are no older than the item's last_checked_at and are
+    skipped, which makes applying a batch twice harmless.
+    """
+
+    def __init__(self):
+        self.enabled = settings.HISTORY_WRITE_BEHIND
+        self.stream = settings.HISTORY_STREAM_KEY
+        self.batch_size = settings.HISTORY_WRITER_BATCH_SIZE
+        self.block_ms = settings.HISTORY_WRITER_BLOCK_MS
+        self.claim_idle_ms = settings.HISTORY_WRITER_CLAIM_IDLE_MS
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._client = None
+        self._group_ready = False
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=(self.block_ms / 1000) + 5)
+        return self._client
+
+    def append_many(self, observations: Iterable[Observation]):
+        """Queue observations for the writer; raises on Redis errors so the caller's check is not lost silently.
+
+        Each item's last queued price is stored in the same transaction, so
+        checks compare against it rather than a catalog row the writer may
+        not have updated yet.
+        """
+        pipe = self.client.pipeline(transaction=True)
+        count = 0
+        for item_id, price, checked_at in observations:
+            pipe.xadd(self.stream, {'item': item_id, 'price': str(price), 'at': checked_at.isoformat()})
+            pipe.set(f"{LAST_PRICE_PREFIX}{item_id}", str(price), ex=LAST_PRICE_TTL_SECONDS)
+            count += 1
+        if count:
+            pipe.execute()
+            metrics.increment('history_observations_appended_total', count)
+
+    def last_prices(self, item_ids: List[int]) -> Dict[int, Decimal]:
+        """The last price queued for each item that has one still pending or recent."""
+        if not item_ids:
+            return {}
+        values = self.client.mget([f"{LAST_PRICE_PREFIX}{item_id}" for item_id in item_ids])
+        return {item_id: Decimal(value.decode()) for item_id, value in zip(item_ids, values) if value is not None}
+
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            self.client.xgroup_create(self.stream, GROUP, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        self._group_ready = True
+
+    def read_batch(self) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        """Entries abandoned by other writers first, then new ones, up to batch_size."""
+        self._ensure_group()
+        _, entries, *_ = self.client.xautoclaim(
+            self.stream, GROUP, self.consumer, self.claim_idle_ms, start_id='0-0', count=self.batch_size
+        )
+        if entries:
+            metrics.increment('history_observations_reclaimed_total', len(entries))
+            return entries
+        response = self.client.xreadgroup(
+            GROUP, self.consumer, {self.stream: '>'}, count=self.batch_size, block=self.block_ms
+        )
+        return response[0][1] if response else []
+
+    def apply(self, db: Session, entries: List[Tuple[bytes, Dict[bytes, bytes]]]) -> List[int]:
+        """Fold a batch into catalog updates and history rows and commit it; returns the ids of items whose price changed."""
+        observations: Dict[int, List[Tuple[datetime, Decimal]]] = {}
+        for _, fields in entries:
+            if not fields:
+                continue
+            observations.setdefault(int(fields[b'item']), []).append(
+                (datetime.fromisoformat(fields[b'at'].decode()), Decimal(fields[b'price'].decode()))
+            )
+        if not observations:
+            return []
+
+        items = db.query(CatalogItem).filter(CatalogItem.id.in_(list(observations))).all()
+        now = datetime.utcnow()
+        mappings = []
+        history = []
+        changed = []
+        for item in items:
+            price = item.current_price
+            checked_at = item.last_checked_at
+            recent = item.recent_prices
+            for observed_at, observed_price in sorted(observations[item.id]):
+                if checked_at is not None and observed_at <= checked_at:
+                    continue
+                checked_at = observed_at
+                if observed_price != price:
+                    price = observed_price
+                    history.append({'catalog_item_id': item.id, 'price': price, 'recorded_at': observed_at})
+                    recent = append_point(recent, price, observed_at, settings.SPARKLINE_POINTS)
+            if checked_at == item.last_checked_at:
+                continue
+            mappings.append({
+                'id': item.id, 'current_price': price, 'last_checked_at': checked_at,
+                'recent_prices': recent, 'updated_at': now,
+            })
+            if price != item.current_price:
+                changed.append(item.id)
+
+        if mappings:
+            db.execute(update(CatalogItem), mappings)
+        if history:
+            db.execute(insert(PriceHistory), history)
+        db.commit()
+        metrics.increment('history_points_written_total', len(history))
+        return changed
+
+    def acknowledge(self, entries: List[Tuple[bytes, Dict[bytes, bytes]]]):
+        ids = [entry_id for entry_id, _ in entries]
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xack(self.stream, GROUP, *ids)
+        pipe.xdel(self.stream, *ids)
+        pipe.execute()
+
+    def drain(self, db: Session, max_seconds: float) -> Dict:
+        """Apply batches until the stream is empty or max_seconds have passed.
+
+        Returns the number of entries applied, the ids of users whose items
+        changed price, for cache invalidation, and the lag left behind.
+        """
+        deadline = time.monotonic() + max_seconds
+        applied = 0
+        changed_items = set()
+        while time.monotonic() < deadline:
+            entries = self.read_batch()
+            if not entries:
+                break
+            changed_items.update(self.apply(db, entries))
+            self.acknowledge(entries)
+            applied += len(entries)
+            metrics.increment('history_observations_applied_total', len(entries))
+
+        user_ids = set()
+        if changed_items:
+            user_ids = set(db.execute(
+                select(Product.user_id).where(Product.catalog_item_id.in_(changed_items))
+            ).scalars())
+        return {'applied': applied, 'user_ids': user_ids, 'lag': self.record_lag()}
+
+    def lag(self) -> Dict[str, Optional[float]]:
+        """Entries not yet delivered, entries delivered but unacknowledged, and the age of the oldest of either.
+
+        Acknowledged entries are deleted, so the stream holds exactly the
+        pending and undelivered ones and its first entry is the oldest.
+        """
+        self._ensure_group()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xlen(self.stream)
+        pipe.xpending(self.stream, GROUP)
+        pipe.xrange(self.stream, '-', '+', count=1)
+        length, pending, first = pipe.execute()
+        age = None
+        if first:
+            age = max(time.time() - int(first[0][0].split(b'-')[0]) / 1000, 0.0)
+        return {'lag': length - pending['pending'], 'pending': pending['pending'], 'oldest_age_seconds': age}
+
+    def record_lag(self) -> Dict[str, Optional[float]]:
+        status = self.lag()
+        metrics.set_gauge('history_writer_lag', status['lag'])
+        metrics.set_gauge('history_writer_pending', status['pending'])
+        metrics.set_gauge('history_writer_oldest_age_seconds', status['oldest_age_seconds'] or 0)
+        return status
+
+history_writer = HistoryWriter()
@@ -0,0 +1,162 @@
+import csv
+import io
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.product import Product
+from app.models.price_alert import PriceAlert
+from app.schemas.product import ProductCreate, ProductImportRowResult
+from app.services.catalog_service import catalog_service, canonicalize_url
+import logging
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = [
+    'url', 'target_price', 'check_interval_minutes',
+    'manual_price', 'manual_name', 'manual_currency'
+]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class ImportService:
+    def __init__(self):
+        self.max_rows = settings.IMPORT_MAX_ROWS
+        self.batch_size = settings.IMPORT_BATCH_SIZE
+
+    def parse_csv(self, content: bytes) -> List[Dict[str, Any]]:
+        reader = csv.DictReader(io.StringIO(content.decode('utf-8-sig')))
+        if not reader.fieldnames or 'url' not in reader.fieldnames:
+            raise ValueError("CSV must have a header row with at least 'url' and 'target_price' columns")
+
+        rows = []
+        for record in reader:
+            rows.append({
+                key: value.strip()
+                for key, value in record.items()
+                if key in CSV_FIELDS and value is not None and value.strip() != ''
+            })
+        return rows
+
+    def _scrape_many(self, urls: List[str]) -> Dict[str, Tuple[Optional[Dict], Optional[str]]]:
+        from app.services.scraper_client import get_scraper
+
+        unique_urls = list(dict.fromkeys(urls))
+        return dict(zip(unique_urls, get_scraper().scrape_many(unique_urls)))
+
+    def _insert_batch(self, db: Session, user_id: int, batch: List[Tuple[ProductCreate, Dict, bool, ProductImportRowResult]], items: Dict[str, CatalogItem]):
+        now = datetime.utcnow()
+        new_items = {}
+        for item, scraped_data, use_manual, _ in batch:
+            canonical = canonicalize_url(item.url)
+            if canonical not in items and canonical not in new_items:
+                new_items[canonical] = catalog_service.build(
+                    item.url, scraped_data, None if use_manual else now, now
+                )
+
+        try:
+            db.add_all(new_items.values())
+            db.flush()
+
+            products = []
+            for item, _, _, _ in batch:
+                catalog_item = items.get(canonicalize_url(item.url)) or new_items[canonicalize_url(item.url)]
+                products.append(Product(
+                    user_id=user_id,
+                    catalog_item_id=catalog_item.id,
+                    check_interval_minutes=item.check_interval_minutes
+                ))
+            db.add_all(products)
+            db.flush()
+
+            for product, (item, _, _, _) in zip(products, batch):
+                db.add(PriceAlert(product_id=product.id, target_price=item.target_price))
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Bulk import batch of {len(batch)} products failed: {str(e)}")
+            for _, _, _, result in batch:
+                result.status = 'failed'
+                result.error = f"Database error: {str(e)}"
+            return
+
+        items.update(new_items)
+        for product, (_, _, _, result) in zip(products, batch):
+            result.status = 'created'
+            result.product_id = product.id
+
+    def import_products(self, db: Session, user_id: int, rows: List[Dict[str, Any]]) -> List[ProductImportRowResult]:
+        if len(rows) > self.max_rows:
+            raise ValueError(f"Import is limited to {self.max_rows} rows")
+
+        results = []
+        valid = []
+        for index, row in enumerate(rows, start=1):
+            url = row.get('url') if isinstance(row, dict) else None
+            result = ProductImportRowResult(row=index, url=url, status='pending')
+            results.append(result)
+            try:
+                valid.append((ProductCreate.model_validate(row), result))
+            except ValidationError as e:
+                result.status = 'failed'
+                result.error = _validation_message(e)
+
+        # Rows for URLs already in the catalog reuse its data instead of being scraped
+        items = catalog_service.find_many(db, [item.url for item, _ in valid])
+        subscribed = set(db.execute(
+            select(Product.catalog_item_id).where(Product.user_id == user_id)
+        ).scalars())
+        scraped = self._scrape_many([
+            item.url for item, _ in valid
+            if canonicalize_url(item.url) not in items
+        ])
+
+        pending = []
+        claimed = set()
+        for item, result in valid:
+            canonical = canonicalize_url(item.url)
+            existing = items.get(canonical)
+            if (existing is not None and existing.id in subscribed) or canonical in claimed:
+                result.status = 'failed'
+                result.error = "You are already tracking this product"
+                continue
+
+            use_manual = False
+            if existing is not None:
+                scraped_data = None
+            else:
+                scraped_data, error = scraped[item.url]
+                if scraped_data is None:
+                    if item.manual_price is None:
+                        result.status = 'failed'
+                        result.error = f"Failed to scrape product: {error}. Please provide manual_price, manual_name, and manual_currency as fallback."
+                        continue
+                    use_manual = True
+                    scraped_data = {
+                        'price': item.manual_price,
+                        'name': item.manual_name or 'Product',
+                        'currency': item.manual_currency or 'USD',
+                        'image_url': None
+                    }
+            claimed.add(canonical)
+            result.used_manual = use_manual
+            pending.append((item, scraped_data, use_manual, result))
+
+        for start in range(0, len(pending), self.batch_size):
+            self._insert_batch(db, user_id, pending[start:start + self.batch_size], items)
+
+        created = sum(1 for result in results if result.status == 'created')
+        logger.info(f"Bulk import for user {user_id}: {created} of {len(rows)} rows created")
+        return results
+
+import_service = ImportService()
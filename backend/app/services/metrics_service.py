@@ -0,0 +1,84 @@
+import bisect
+import threading
+from typing import Dict, Tuple, Optional
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTE_BUCKETS = (0, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'max': round(self.max, 6),
+            'mean': round(self.total / self.count, 6) if self.count else 0.0,
+            'buckets': buckets,
+        }
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms exposed as JSON on /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.gauges: Dict[Tuple[str, Tuple], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Optional[Dict]) -> Tuple[str, Tuple]:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict] = None):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict] = None):
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None,
+                buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict:
+        def entries(items, render):
+            return [
+                {'name': name, 'labels': dict(labels), 'value': render(value)}
+                for (name, labels), value in sorted(items, key=lambda item: item[0])
+            ]
+
+        with self._lock:
+            return {
+                'counters': entries(self.counters.items(), lambda value: value),
+                'gauges': entries(self.gauges.items(), lambda value: value),
+                'histograms': entries(self.histograms.items(), lambda value: value.snapshot()),
+            }
+
+metrics = MetricsRegistry()
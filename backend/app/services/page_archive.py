@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+# The archive stores decoded bodies, so these no longer describe what is replayed.
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class PageArchive:
+    """Content-addressed store of fetched pages for offline scraping runs.
+
+    Bodies are gzipped under objects/ and keyed by the SHA-256 of the decoded
+    body, so identical pages are stored once. index/ holds one JSON entry per
+    URL with the status, headers and body hash of its latest recording.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.base_dir, 'objects', digest[:2], f"{digest}.gz")
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.base_dir, 'index', f"{_sha256(url.encode('utf-8'))}.json")
+
+    def record(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> Dict:
+        digest = _sha256(body)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            _write_atomic(path, gzip.compress(body, mtime=0))
+
+        entry = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            'body': digest,
+            'size': len(body),
+            'recorded_at': datetime.utcnow().isoformat(),
+        }
+        _write_atomic(self._index_path(url), json.dumps(entry).encode('utf-8'))
+        return entry
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._index_path(url), 'rb') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def read_body(self, digest: str) -> bytes:
+        with open(self._object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def entries(self) -> Iterator[Dict]:
+        index_dir = os.path.join(self.base_dir, 'index')
+        if not os.path.isdir(index_dir):
+            return
+        for filename in sorted(os.listdir(index_dir)):
+            if filename.endswith('.json'):
+                with open(os.path.join(index_dir, filename), 'rb') as f:
+                    yield json.load(f)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport that answers requests from a PageArchive and never touches the network."""
+
+    def __init__(self, archive: PageArchive, **kwargs):
+        self.archive = archive
+        super().__init__(**kwargs)
+
+    def _replay(self, request, entry: Dict) -> requests.Response:
+        body = self.archive.read_body(entry['body'])
+        headers = dict(entry['headers'], **{'Content-Length': str(len(body))})
+        raw = HTTPResponse(
+            body=io.BytesIO(body), headers=headers, status=entry['status'],
+            preload_content=False, decode_content=False, request_url=request.url
+        )
+        return self.build_response(request, raw)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        entry = self.archive.lookup(request.url)
+        if entry is None:
+            raise requests.ConnectionError(f"No archived response for {request.url}", request=request)
+        return self._replay(request, entry)
+
+
+class RecordingAdapter(ReplayAdapter):
+    """Transport that fetches live, stores each response in the archive and returns it as replayed."""
+
+    def send(self, request, **kwargs) -> requests.Response:
+        kwargs['stream'] = False
+        response = HTTPAdapter.send(self, request, **kwargs)
+        entry = self.archive.record(request.url, response.status_code, dict(response.headers), response.content)
+        return self._replay(request, entry)
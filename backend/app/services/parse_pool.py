@@ -0,0 +1,61 @@
+import os
+import threading
+from typing import Dict, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_in_worker(content: bytes, url: str) -> Optional[Dict]:
+    from app.services.scraper_service import scraper_service
+    return scraper_service._extract(content, url)
+
+
+class ParsePool:
+    """Runs page extraction in a process pool so parsing does not hold the fetching process's GIL.
+
+    The pool is billiard's, which unlike multiprocessing may be started from
+    daemonic processes, so Celery prefork children get their own small
+    pool. Bodies cross the boundary as the raw bytes read off the socket and
+    only the small extraction dict comes back. At most `max_pending` bodies
+    are in flight; further callers block, which throttles fetch threads to
+    the pool's parsing speed. Disabled processes parse inline; the Celery
+    worker enables the pool in each child at start-up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.enabled = False
+        self.workers = workers or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def enable(self):
+        self.enabled = True
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    import billiard
+
+                    # forkserver: the fetching process is multi-threaded, which plain fork does not survive safely
+                    self._pool = billiard.get_context('forkserver').Pool(processes=self.workers)
+        return self._pool
+
+    def extract(self, content: bytes, url: str) -> Optional[Dict]:
+        if not self.enabled:
+            return _extract_in_worker(content, url)
+
+        with self._slots:
+            return self._get_pool().apply_async(_extract_in_worker, (content, url)).get()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+parse_pool = ParsePool(settings.SCRAPER_PARSE_WORKERS, settings.SCRAPER_PARSE_MAX_PENDING)
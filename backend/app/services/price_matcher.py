@@ -0,0 +1,114 @@
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
+
+# Insertion order is the detection priority when a text mentions several currencies.
+CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '¥': 'JPY',
+    '₹': 'INR',
+    'Rs': 'INR',
+    'USD': 'USD',
+    'EUR': 'EUR',
+    'GBP': 'GBP',
+    'INR': 'INR',
+}
+CURRENCY_PRIORITY = {symbol: rank for rank, symbol in enumerate(CURRENCY_SYMBOLS)}
+CURRENCY_BY_RANK = list(CURRENCY_SYMBOLS.values())
+DEFAULT_CURRENCY = 'USD'
+
+
+def _token_pattern() -> re.Pattern:
+    """Amounts and currency symbols as one pattern that opens with a single character class.
+
+    SRE only skips ahead with a fast charset scan when the pattern starts with a
+    class, so each token's first character is matched there and the remainder is
+    selected by a lookbehind on it.
+    """
+    symbols = sorted(CURRENCY_SYMBOLS, key=len, reverse=True)
+    first = ''.join(sorted({re.escape(symbol[0]) for symbol in symbols}))
+    rests = [f'(?<={re.escape(symbol[0])}){re.escape(symbol[1:])}' for symbol in symbols]
+    return re.compile(rf'[\d{first}](?:(?<=\d)\d{{0,2}}(?:,\d{{3}})*(?:\.\d{{2}})?|{"|".join(rests)})')
+
+TEXT_TOKEN_PATTERN = _token_pattern()
+
+# Every price key, and priceCurrency, contains "rice": the literal prefix lets SRE jump
+# between occurrences and the lookbehinds tell the keys apart. m.lastgroup names the key.
+SCRIPT_PATTERN = re.compile(
+    r'rice(?:'
+    r'(?<="price)"\s*:\s*"?(?P<price>\d+\.?\d*)'
+    r'|(?<=price):\s*"?(?P<bare>\d+\.?\d*)'
+    r'|(?<="currentPrice)"\s*:\s*"?(?P<currentPrice>\d+\.?\d*)'
+    r'|(?<="salePrice)"\s*:\s*"?(?P<salePrice>\d+\.?\d*)'
+    r'|(?<="price)Currency"\s*:\s*"(?P<priceCurrency>[A-Z]{3})"'
+    r')'
+)
+SCRIPT_PRICE_KEYS = ('price', 'bare', 'currentPrice', 'salePrice')
+SCRIPT_CURRENCY_PATTERN = re.compile(r'"currency"\s*:\s*"([A-Z]{3})"')
+
+
+def _positive(amount: str) -> Optional[Decimal]:
+    try:
+        price = Decimal(amount.replace(',', ''))
+    except InvalidOperation:
+        return None
+    return price if price > 0 else None
+
+
+class PriceMatcher:
+    """Price and currency extraction from free text and inline scripts using patterns compiled once."""
+
+    def detect_currency(self, text: str) -> str:
+        ranks = [CURRENCY_PRIORITY[token] for token in TEXT_TOKEN_PATTERN.findall(text) if token in CURRENCY_PRIORITY]
+        return CURRENCY_BY_RANK[min(ranks)] if ranks else DEFAULT_CURRENCY
+
+    def match_text(self, text: str) -> Optional[Tuple[Decimal, str]]:
+        """First positive amount in `text` and the highest-priority currency mentioned anywhere in it."""
+        price = None
+        best = None
+        for token in TEXT_TOKEN_PATTERN.findall(text):
+            rank = CURRENCY_PRIORITY.get(token)
+            if rank is None:
+                if price is None:
+                    price = _positive(token)
+            elif best is None or rank < best:
+                best = rank
+
+        if price is None:
+            return None
+        return (price, DEFAULT_CURRENCY if best is None else CURRENCY_BY_RANK[best])
+
+    def match_script(self, text: str) -> Optional[Tuple[Decimal, str]]:
+        """Price from the best-ranked key in an inline script, with its "currency" or "priceCurrency" code.
+
+        The scan stops at the first positive quoted "price"; it is only resumed
+        to find a priceCurrency when the script has no "currency" key.
+        """
+        prices = {}
+        fallback_currency = None
+        matches = SCRIPT_PATTERN.finditer(text)
+        for match in matches:
+            key = match.lastgroup
+            if key == 'priceCurrency':
+                fallback_currency = fallback_currency or match.group(key)
+            elif prices.get(key) is None:
+                prices[key] = _positive(match.group(key))
+                if key == 'price' and prices[key] is not None:
+                    break
+
+        price = next((prices[key] for key in SCRIPT_PRICE_KEYS if prices.get(key) is not None), None)
+        if price is None:
+            return None
+
+        currency = SCRIPT_CURRENCY_PATTERN.search(text)
+        if currency:
+            return (price, currency.group(1))
+        if fallback_currency is None:
+            fallback_currency = next(
+                (match.group(match.lastgroup) for match in matches if match.lastgroup == 'priceCurrency'), None
+            )
+        return (price, fallback_currency or DEFAULT_CURRENCY)
+
+price_matcher = PriceMatcher()
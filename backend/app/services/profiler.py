@@ -0,0 +1,184 @@
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.metrics_service import Histogram
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_LENGTH = 300
+
+
+class RequestProfile:
+    """SQL and timing totals for one sampled request."""
+
+    __slots__ = ('top_queries', 'sql_count', 'sql_time', 'timings', 'top_queries_heap', '_lock')
+
+    def __init__(self, top_queries: int):
+        self.top_queries = top_queries
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.timings: Dict[str, float] = {}
+        self.top_queries_heap: List[Tuple[float, int, str]] = []
+        self._lock = threading.Lock()
+
+    def record_query(self, statement: str, elapsed: float):
+        with self._lock:
+            self.sql_count += 1
+            self.sql_time += elapsed
+            entry = (elapsed, self.sql_count, statement)
+            if len(self.top_queries_heap) < self.top_queries:
+                heapq.heappush(self.top_queries_heap, entry)
+            elif elapsed > self.top_queries_heap[0][0]:
+                heapq.heapreplace(self.top_queries_heap, entry)
+
+    def record_timing(self, name: str, elapsed: float):
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def slowest_queries(self) -> List[Tuple[float, str]]:
+        return [(elapsed, statement) for elapsed, _, statement in sorted(self.top_queries_heap, reverse=True)]
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.slow = 0
+        self.wall = Histogram()
+        self.sampled = 0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.timings: Dict[str, float] = {}
+
+    def snapshot(self) -> Dict:
+        sampled = self.sampled or 1
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'slow': self.slow,
+            'wall_seconds': self.wall.snapshot(),
+            'sampled': self.sampled,
+            'mean_sql_statements': round(self.sql_count / sampled, 2),
+            'mean_sql_seconds': round(self.sql_time / sampled, 6),
+            'mean_timings_seconds': {
+                name: round(total / sampled, 6) for name, total in sorted(self.timings.items())
+            },
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar('request_profile', default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def track(name: str):
+    """Charge the time spent in the block to `name` on the current request's profile."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record_timing(name, time.perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault('profile_query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started = conn.info.get('profile_query_started')
+    if not started:
+        return
+    profile.record_query(statement[:MAX_STATEMENT_LENGTH], time.perf_counter() - started.pop())
+
+
+class RequestProfiler:
+    """Aggregates per-route request timings and logs slow requests with their top queries.
+
+    Wall time is recorded for every request; SQL statements and named timings
+    are only collected for the sampled fraction so the engine event hooks cost
+    a context variable lookup on everything else.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.installed = False
+
+    def install(self):
+        if self.installed:
+            return
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        self.installed = True
+
+    def start(self, top_queries: int) -> Tuple[RequestProfile, object]:
+        profile = RequestProfile(top_queries)
+        return profile, _current_profile.set(profile)
+
+    def finish(self, token):
+        _current_profile.reset(token)
+
+    def record(self, method: str, route: str, status: int, elapsed: float,
+               profile: Optional[RequestProfile], slow_threshold: float):
+        slow = elapsed >= slow_threshold
+        key = (method, route)
+        with self._lock:
+            stats = self.routes.get(key)
+            if stats is None:
+                stats = self.routes[key] = RouteStats()
+            stats.requests += 1
+            stats.wall.observe(elapsed)
+            if status >= 500:
+                stats.errors += 1
+            if slow:
+                stats.slow += 1
+            if profile is not None:
+                stats.sampled += 1
+                stats.sql_count += profile.sql_count
+                stats.sql_time += profile.sql_time
+                for name, value in profile.timings.items():
+                    stats.timings[name] = stats.timings.get(name, 0.0) + value
+
+        if slow:
+            self._log_slow(method, route, status, elapsed, profile)
+
+    def _log_slow(self, method: str, route: str, status: int, elapsed: float, profile: Optional[RequestProfile]):
+        message = f"Slow request {method} {route} -> {status} took {elapsed * 1000:.1f}ms"
+        if profile is None:
+            logger.warning(f"{message} (not sampled)")
+            return
+        timings = ", ".join(f"{name} {value * 1000:.1f}ms" for name, value in sorted(profile.timings.items()))
+        queries = "".join(
+            f"\n  {query_elapsed * 1000:.1f}ms {statement}"
+            for query_elapsed, statement in profile.slowest_queries()
+        )
+        logger.warning(
+            f"{message}: {profile.sql_count} SQL statements in {profile.sql_time * 1000:.1f}ms"
+            f"{'; ' + timings if timings else ''}{queries}"
+        )
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {'method': method, 'route': route, **stats.snapshot()}
+                for (method, route), stats in sorted(self.routes.items(), key=lambda item: (item[0][1], item[0][0]))
+            ]
+
+request_profiler = RequestProfiler()
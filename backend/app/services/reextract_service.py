@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import update, insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.price_history import PriceHistory
+from app.services.catalog_service import catalog_service, canonicalize_url
+from app.services.page_archive import PageArchive
+from app.services.sparkline import append_point
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Extracted field -> catalog column
+FIELDS = {'price': 'current_price', 'name': 'name', 'image_url': 'image_url'}
+
+
+def _extract_batch(base_dir: str, entries: List[Tuple[str, str]]) -> List[Tuple[str, Optional[Dict], Optional[str]]]:
+    """Process-pool worker: read each archived body and run the current extraction over it."""
+    from app.services.scraper_service import scraper_service
+
+    archive = PageArchive(base_dir)
+    results = []
+    for url, digest in entries:
+        try:
+            results.append((url, scraper_service._extract(archive.read_body(digest), url), None))
+        except Exception as e:
+            results.append((url, None, str(e)))
+    return results
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ReextractService:
+    """Re-runs extraction over archived pages and diffs the result against the catalog.
+
+    Parsing happens in a process pool; workers read bodies from the archive
+    themselves so only URLs, hashes and extracted fields cross process
+    boundaries. Diffing and corrections run in the parent in DB batches.
+    """
+
+    def __init__(self, archive: PageArchive, workers: Optional[int] = None, chunk_size: int = 64,
+                 db_batch_size: int = 500):
+        self.archive = archive
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.db_batch_size = db_batch_size
+
+    def extract(self) -> Iterator[Tuple[Dict, Optional[Dict], Optional[str]]]:
+        """Yield (archive entry, extracted fields, error) as workers finish, in no particular order."""
+        entries = {entry['url']: entry for entry in self.archive.entries() if entry['status'] == 200}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(_extract_batch, self.archive.base_dir, [(url, entry['body']) for url, entry in chunk])
+                for chunk in _chunks(entries.items(), self.chunk_size)
+            ]
+            for future in as_completed(futures):
+                for url, extracted, error in future.result():
+                    yield entries[url], extracted, error
+
+    def diff(self, item: CatalogItem, extracted: Dict) -> Dict:
+        """Fields whose re-extracted value differs from the catalog, as {field: (stored, extracted)}."""
+        changes = {}
+        for field, column in FIELDS.items():
+            value = extracted.get(field)
+            stored = getattr(item, column)
+            if value is not None and value != stored:
+                changes[field] = (stored, value)
+        return changes
+
+    def run(self, db: Session, apply: bool = False, include_stale: bool = False) -> Iterator[Dict]:
+        """Yield one report row per archived page; with apply=True corrections are written in bulk.
+
+        Pages recorded before the item's last check are reported as stale and
+        not diffed, since the catalog holds a newer scrape than the archive.
+        """
+        for batch in _chunks(self.extract(), self.db_batch_size):
+            items = catalog_service.find_many(db, [entry['url'] for entry, _, _ in batch])
+            corrections = []
+            for entry, extracted, error in batch:
+                item = items.get(canonicalize_url(entry['url']))
+                row = {'url': entry['url'], 'catalog_item_id': item.id if item else None}
+
+                if error or not extracted:
+                    row['status'] = 'failed'
+                    row['error'] = error or 'no price extracted'
+                elif item is None:
+                    row['status'] = 'untracked'
+                elif (not include_stale and item.last_checked_at
+                      and datetime.fromisoformat(entry['recorded_at']) < item.last_checked_at):
+                    row['status'] = 'stale'
+                else:
+                    changes = self.diff(item, extracted)
+                    row['status'] = 'changed' if changes else 'unchanged'
+                    row['changes'] = {field: [str(old), str(new)] for field, (old, new) in changes.items()}
+                    if changes:
+                        corrections.append((item, changes))
+                yield row
+
+            if apply and corrections:
+                self.apply(db, corrections)
+
+    def apply(self, db: Session, corrections: List[Tuple[CatalogItem, Dict]]):
+        """Write a batch of corrections with one executemany UPDATE and one history INSERT."""
+        now = datetime.utcnow()
+        mappings = []
+        history = []
+        for item, changes in corrections:
+            values = {'id': item.id, 'updated_at': now}
+            for field, (_, value) in changes.items():
+                values[FIELDS[field]] = value
+            if 'price' in changes:
+                price = Decimal(changes['price'][1])
+                history.append({'catalog_item_id': item.id, 'price': price, 'recorded_at': now})
+                values['recent_prices'] = append_point(item.recent_prices, price, now, settings.SPARKLINE_POINTS)
+            mappings.append(values)
+
+        db.execute(update(CatalogItem), mappings)
+        if history:
+            db.execute(insert(PriceHistory), history)
+        db.commit()
+        logger.info(f"Applied re-extraction corrections to {len(mappings)} catalog items")
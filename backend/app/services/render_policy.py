@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+
+# Price extraction only needs the DOM, scripts and the XHR/fetch calls that fill it in.
+BLOCKED_RESOURCE_TYPES = frozenset({
+    'image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest', 'eventsource', 'websocket',
+})
+
+TRACKER_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'googlesyndication.com',
+    'doubleclick.net', 'facebook.net', 'connect.facebook.com', 'hotjar.com', 'segment.io', 'segment.com',
+    'optimizely.com', 'nr-data.net', 'newrelic.com', 'criteo.com', 'criteo.net', 'taboola.com',
+    'outbrain.com', 'scorecardresearch.com', 'clarity.ms', 'bat.bing.com', 'analytics.tiktok.com',
+    'ct.pinterest.com', 'quantserve.com', 'adnxs.com', 'amazon-adsystem.com', 'fullstory.com',
+)
+
+
+def _matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class RenderPolicy:
+    """Decides which requests a Playwright render may make.
+
+    Non-essential resource types and tracker domains are aborted. The allowlist
+    maps a site domain to resource types or hosts that the site needs anyway,
+    e.g. {"shop.example": ["stylesheet", "cdn.shop.example"]}.
+    """
+
+    def __init__(self, allowlist: Optional[Dict[str, List[str]]] = None,
+                 tracker_domains: Iterable[str] = TRACKER_DOMAINS,
+                 blocked_types: Iterable[str] = BLOCKED_RESOURCE_TYPES):
+        self.allowlist = allowlist or {}
+        self.tracker_domains = tuple(tracker_domains)
+        self.blocked_types = frozenset(blocked_types)
+
+    def allowed_for(self, page_host: str) -> frozenset:
+        return frozenset(
+            entry
+            for site, entries in self.allowlist.items() if _matches(page_host, [site])
+            for entry in entries
+        )
+
+    def should_block(self, request_url: str, resource_type: str, allowed: frozenset = frozenset()) -> bool:
+        host = (urlsplit(request_url).hostname or '').lower()
+        if resource_type in allowed or _matches(host, allowed):
+            return False
+        return resource_type in self.blocked_types or _matches(host, self.tracker_domains)
+
+    def install(self, page, url: str) -> Dict[str, int]:
+        """Route every request of `page` through the policy; returns live allowed/blocked counts."""
+        allowed = self.allowed_for((urlsplit(url).hostname or '').lower())
+        counts = {'allowed': 0, 'blocked': 0}
+
+        def handle(route):
+            request = route.request
+            if self.should_block(request.url, request.resource_type, allowed):
+                counts['blocked'] += 1
+                route.abort()
+            else:
+                counts['allowed'] += 1
+                route.continue_()
+
+        page.route('**/*', handle)
+        return counts
+
+render_policy = RenderPolicy(settings.PLAYWRIGHT_ALLOWLIST)
@@ -0,0 +1,286 @@
+import os
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Dict
+from sqlalchemy import func, select, insert, delete, exists, text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.catalog_item import CatalogItem
+from app.models.price_history import PriceHistory
+from app.models.price_history_rollup import PriceHistoryRollup
+from app.models.product import Product
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 10000
+PURGE_BATCH_SIZE = 500
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+class HistoryArchive:
+    """Monthly Parquet files holding price history rows dropped from the database."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def _path(self, month: date) -> str:
+        return os.path.join(self.base_dir, f"{month.year:04d}-{month.month:02d}.parquet")
+
+    def _schema(self):
+        import pyarrow as pa
+
+        return pa.schema([
+            ('id', pa.int64()),
+            ('catalog_item_id', pa.int64()),
+            ('price', pa.decimal128(10, 2)),
+            ('recorded_at', pa.timestamp('us')),
+        ])
+
+    def archived_months(self) -> List[date]:
+        if not os.path.isdir(self.base_dir):
+            return []
+
+        months = []
+        for filename in os.listdir(self.base_dir):
+            if not filename.endswith('.parquet'):
+                continue
+            try:
+                months.append(datetime.strptime(filename[:-len('.parquet')], '%Y-%m').date())
+            except ValueError:
+                continue
+        return sorted(months)
+
+    def write_month(self, db: Session, month: date) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = self._path(month)
+        tmp_path = path + '.tmp'
+        schema = self._schema()
+
+        stmt = select(
+            PriceHistory.id, PriceHistory.catalog_item_id, PriceHistory.price, PriceHistory.recorded_at
+        ).where(
+            PriceHistory.recorded_at >= month,
+            PriceHistory.recorded_at < add_months(month, 1)
+        ).order_by(PriceHistory.catalog_item_id, PriceHistory.recorded_at)
+
+        written = 0
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+            for rows in result.partitions():
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                written += len(rows)
+
+        os.replace(tmp_path, path)
+        return written
+
+    def read(
+        self,
+        catalog_item_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        legacy_product_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Archived rows for a catalog item, newest first.
+
+        Months archived before the shared catalog are keyed by the old per-user
+        product id, which is matched against `legacy_product_id` instead.
+        """
+        import pyarrow.parquet as pq
+
+        months = self.archived_months()
+        if start_date:
+            months = [m for m in months if m >= month_start(start_date)]
+        if end_date:
+            months = [m for m in months if m <= month_start(end_date)]
+
+        rows = []
+        for month in reversed(months):
+            if 'catalog_item_id' in pq.read_schema(self._path(month)).names:
+                filters = [('catalog_item_id', '=', catalog_item_id)]
+            elif legacy_product_id is not None:
+                filters = [('product_id', '=', legacy_product_id)]
+            else:
+                continue
+            if start_date:
+                filters.append(('recorded_at', '>=', start_date))
+            if end_date:
+                filters.append(('recorded_at', '<=', end_date))
+
+            table = pq.read_table(self._path(month), filters=filters)
+            month_rows = table.to_pylist()
+            month_rows.sort(key=lambda row: row['recorded_at'], reverse=True)
+            rows.extend(month_rows)
+
+            if limit is not None and len(rows) >= limit:
+                return rows[:limit]
+        return rows
+
+
+class RetentionService:
+    def __init__(self):
+        self.retention_months = settings.HISTORY_RETENTION_MONTHS
+        self.partitions_ahead = settings.HISTORY_PARTITIONS_AHEAD
+        self.orphan_retention = timedelta(days=settings.CATALOG_ORPHAN_RETENTION_DAYS)
+        self.archive = HistoryArchive(settings.HISTORY_ARCHIVE_DIR)
+
+    def _is_partitioned(self, db: Session) -> bool:
+        if db.bind.dialect.name != 'mysql':
+            return False
+        count = db.execute(text(
+            "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'price_history' "
+            "AND PARTITION_NAME IS NOT NULL"
+        )).scalar()
+        return bool(count)
+
+    def _partitions(self, db: Session) -> List[str]:
+        return list(db.execute(text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'price_history' "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        )).scalars())
+
+    def ensure_partitions(self, db: Session, now: Optional[datetime] = None) -> List[str]:
+        if not self._is_partitioned(db):
+            return []
+
+        existing = set(self._partitions(db))
+        current = month_start(now or datetime.utcnow())
+        missing = []
+        for offset in range(self.partitions_ahead + 1):
+            month = add_months(current, offset)
+            if partition_name(month) not in existing:
+                missing.append(month)
+
+        if not missing:
+            return []
+
+        definitions = ", ".join(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{add_months(month, 1).isoformat()}'))"
+            for month in missing
+        )
+        db.execute(text(
+            f"ALTER TABLE price_history REORGANIZE PARTITION pmax INTO "
+            f"({definitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+        created = [partition_name(month) for month in missing]
+        logger.info(f"Created price_history partitions: {', '.join(created)}")
+        return created
+
+    def _rollup_month(self, db: Session, month: date):
+        next_month = add_months(month, 1)
+
+        db.query(PriceHistoryRollup).filter(
+            PriceHistoryRollup.period_start >= month,
+            PriceHistoryRollup.period_start < next_month
+        ).delete(synchronize_session=False)
+
+        period = func.date(PriceHistory.recorded_at)
+        db.execute(insert(PriceHistoryRollup).from_select(
+            ['catalog_item_id', 'period_start', 'min_price', 'max_price', 'avg_price', 'sample_count'],
+            select(
+                PriceHistory.catalog_item_id,
+                period,
+                func.min(PriceHistory.price),
+                func.max(PriceHistory.price),
+                func.avg(PriceHistory.price),
+                func.count(PriceHistory.id)
+            ).where(
+                PriceHistory.recorded_at >= month,
+                PriceHistory.recorded_at < next_month
+            ).group_by(PriceHistory.catalog_item_id, period)
+        ))
+
+    def expired_months(self, db: Session, now: Optional[datetime] = None) -> List[date]:
+        cutoff = add_months(month_start(now or datetime.utcnow()), -self.retention_months)
+        oldest = db.query(func.min(PriceHistory.recorded_at)).scalar()
+        if oldest is None:
+            return []
+
+        months = []
+        month = month_start(oldest)
+        while month < cutoff:
+            months.append(month)
+            month = add_months(month, 1)
+        return months
+
+    def archive_month(self, db: Session, month: date, partitioned: bool) -> int:
+        exported = self.archive.write_month(db, month)
+        self._rollup_month(db, month)
+        db.commit()
+
+        if partitioned:
+            if partition_name(month) in self._partitions(db):
+                db.execute(text(f"ALTER TABLE price_history DROP PARTITION {partition_name(month)}"))
+        else:
+            db.query(PriceHistory).filter(
+                PriceHistory.recorded_at >= month,
+                PriceHistory.recorded_at < add_months(month, 1)
+            ).delete(synchronize_session=False)
+            db.commit()
+
+        logger.info(f"Archived {exported} price history rows for {month:%Y-%m}")
+        return exported
+
+    def purge_orphaned_items(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete catalog items nobody has subscribed to for the orphan retention period, with their history.
+
+        Items are kept for a while after their last subscription goes so a
+        user re-adding the page gets its history back. The subscription check
+        is repeated in the DELETE, so an item subscribed to meanwhile stays.
+        """
+        cutoff = (now or datetime.utcnow()) - self.orphan_retention
+        unsubscribed = ~exists().where(Product.catalog_item_id == CatalogItem.id)
+        candidates = list(db.execute(select(CatalogItem.id).where(
+            unsubscribed,
+            func.coalesce(CatalogItem.last_checked_at, CatalogItem.created_at) < cutoff
+        )).scalars())
+
+        purged = 0
+        for start in range(0, len(candidates), PURGE_BATCH_SIZE):
+            batch = candidates[start:start + PURGE_BATCH_SIZE]
+            db.execute(delete(CatalogItem).where(CatalogItem.id.in_(batch), unsubscribed))
+            remaining = set(db.execute(select(CatalogItem.id).where(CatalogItem.id.in_(batch))).scalars())
+            deleted = [item_id for item_id in batch if item_id not in remaining]
+            if deleted:
+                # Partitioned MySQL history has no foreign key to cascade through
+                db.execute(delete(PriceHistory).where(PriceHistory.catalog_item_id.in_(deleted)))
+                db.execute(delete(PriceHistoryRollup).where(PriceHistoryRollup.catalog_item_id.in_(deleted)))
+            db.commit()
+            purged += len(deleted)
+
+        if purged:
+            logger.info(f"Purged {purged} catalog items without subscriptions")
+        return purged
+
+    def enforce(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        partitioned = self._is_partitioned(db)
+        archived = {}
+        for month in self.expired_months(db, now):
+            archived[f"{month:%Y-%m}"] = self.archive_month(db, month, partitioned)
+
+        created = self.ensure_partitions(db, now)
+        purged = self.purge_orphaned_items(db, now)
+        return {'archived': archived, 'partitions_created': created, 'orphans_purged': purged}
+
+retention_service = RetentionService()
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperClient:
+    """Calls the scraping service's batch endpoint; same interface as the in-process batch scraper."""
+
+    def __init__(self, base_url: Optional[str], token: Optional[str], timeout: int, batch_size: int):
+        self.base_url = base_url
+        self.token = token
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+
+            headers = {'X-Scraper-Token': self.token} if self.token else {}
+            self._client = httpx.Client(base_url=self.base_url, headers=headers, timeout=self.timeout)
+        return self._client
+
+    def _post(self, urls: List[str]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        try:
+            response = self.client.post('/scrape', json={'urls': urls})
+            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Scraping service request failed for {len(urls)} URLs: {str(e)}")
+            return [(None, f"Failed to scrape product: scraping service unavailable ({str(e)})")] * len(urls)
+
+        results = []
+        for row in response.json()['results']:
+            if row['error'] is not None:
+                results.append((None, row['error']))
+            else:
+                results.append(({
+                    'price': Decimal(row['price']),
+                    'name': row['name'],
+                    'image_url': row['image_url'],
+                    'currency': row['currency'],
+                }, None))
+        return results
+
+    def scrape_many(self, urls: List[str]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """(scraped fields, error message) for each URL, in the order given."""
+        results = []
+        for start in range(0, len(urls), self.batch_size):
+            results.extend(self._post(urls[start:start + self.batch_size]))
+        return results
+
+    def scrape_product(self, url: str) -> Dict:
+        data, error = self._post([url])[0]
+        if error is not None:
+            raise Exception(error)
+        return data
+
+scraper_client = ScraperClient(
+    settings.SCRAPER_SERVICE_URL,
+    settings.SCRAPER_SERVICE_TOKEN,
+    settings.SCRAPER_SERVICE_TIMEOUT,
+    settings.SCRAPER_BATCH_MAX_URLS
+)
+
+
+def get_scraper():
+    """The scraping service client when SCRAPER_SERVICE_URL is set, otherwise the in-process batch scraper."""
+    if settings.SCRAPER_SERVICE_URL:
+        return scraper_client
+    from app.services.batch_scraper import batch_scraper
+    return batch_scraper
@@ -1,11 +1,21 @@
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 from decimal import Decimal
+from urllib.parse import urlsplit
 import json
 import logging
 import time
+from lxml import etree
+from app.config import settings
+from app.services.profiler import track
+from app.services.metrics_service import metrics, BYTE_BUCKETS
+from app.services.stream_parser import PageSignals
+from app.services.site_rules import site_rules
+from app.services.parse_pool import parse_pool
+from app.services.price_matcher import price_matcher, CURRENCY_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
@@ -16,22 +26,44 @@ class ScraperService:
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     ]
     
-    CURRENCY_SYMBOLS = {
-        '$': 'USD',
-        '€': 'EUR',
-        '£': 'GBP',
-        '¥': 'JPY',
-        '₹': 'INR',
-        'Rs': 'INR',
-        'USD': 'USD',
-        'EUR': 'EUR',
-        'GBP': 'GBP',
-        'INR': 'INR',
-    }
+    CURRENCY_SYMBOLS = CURRENCY_SYMBOLS
+    
+    PRICE_SELECTORS = [
+        {'class': re.compile(r'price', re.I)},
+        {'class': re.compile(r'cost', re.I)},
+        {'class': re.compile(r'amount', re.I)},
+        {'class': re.compile(r'product-price', re.I)},
+        {'class': re.compile(r'price-current', re.I)},
+        {'id': re.compile(r'price', re.I)},
+        {'itemprop': 'price'},
+        {'data-price': True},
+    ]
+    PRODUCT_PATTERN = re.compile(r'product', re.I)
     
     def __init__(self):
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.current_user_agent_index = 0
+        self.archive_mode = 'off'
+        if settings.SCRAPER_ARCHIVE_MODE != 'off':
+            from app.services.page_archive import PageArchive
+            self.use_archive(settings.SCRAPER_ARCHIVE_MODE, PageArchive(settings.SCRAPER_ARCHIVE_DIR))
+    
+    def use_archive(self, mode: str, archive):
+        """Record every fetched page into `archive`, or replay pages from it without network access."""
+        from app.services.page_archive import RecordingAdapter, ReplayAdapter
+        
+        if mode == 'record':
+            adapter = RecordingAdapter(archive, pool_connections=32, pool_maxsize=32)
+        elif mode == 'replay':
+            adapter = ReplayAdapter(archive)
+        else:
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.archive_mode = mode
     
     def _get_user_agent(self) -> str:
         agent = self.USER_AGENTS[self.current_user_agent_index]
@@ -39,32 +71,10 @@ class ScraperService:
         return agent
     
     def _detect_currency(self, text: str, price: Decimal) -> str:
-        for symbol, currency in self.CURRENCY_SYMBOLS.items():
-            if symbol in text:
-                return currency
-        return 'USD'
+        return price_matcher.detect_currency(text)
     
     def _extract_price_from_text(self, text: str) -> Optional[tuple]:
-        price_patterns = [
-            r'[₹Rs\.]*\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'[\$€£¥]\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:USD|EUR|GBP|INR|Rs)',
-            r'Price[:\s]*[₹\$€£¥Rs\.]*\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                price_str = match.group(1).replace(',', '')
-                try:
-                    price = Decimal(price_str)
-                    if price > 0:
-                        currency = self._detect_currency(text, price)
-                        return (price, currency)
-                except:
-                    continue
-        return None
+        return price_matcher.match_text(text)
     
     def _extract_price_from_meta(self, soup: BeautifulSoup) -> Optional[tuple]:
         meta_tags = [
@@ -141,18 +151,7 @@ class ScraperService:
         return None
     
     def _extract_price_from_selectors(self, soup: BeautifulSoup) -> Optional[tuple]:
-        price_selectors = [
-            {'class': re.compile(r'price', re.I)},
-            {'class': re.compile(r'cost', re.I)},
-            {'class': re.compile(r'amount', re.I)},
-            {'class': re.compile(r'product-price', re.I)},
-            {'class': re.compile(r'price-current', re.I)},
-            {'id': re.compile(r'price', re.I)},
-            {'itemprop': 'price'},
-            {'data-price': True},
-        ]
-        
-        for selector in price_selectors:
+        for selector in self.PRICE_SELECTORS:
             elements = soup.find_all(attrs=selector)
             for elem in elements:
                 text = elem.get_text(strip=True)
@@ -173,41 +172,13 @@ class ScraperService:
         return None
     
     def _extract_price_from_scripts(self, soup: BeautifulSoup) -> Optional[tuple]:
-        scripts = soup.find_all('script')
-        for script in scripts:
+        for script in soup.find_all('script'):
             if not script.string:
                 continue
             
-            price_patterns = [
-                r'"price"\s*:\s*"?(\d+\.?\d*)"?',
-                r'"price"\s*:\s*(\d+\.?\d*)',
-                r'price:\s*"?(\d+\.?\d*)"?',
-                r'"currentPrice"\s*:\s*"?(\d+\.?\d*)"?',
-                r'"salePrice"\s*:\s*"?(\d+\.?\d*)"?',
-            ]
-            
-            currency_patterns = [
-                r'"currency"\s*:\s*"([A-Z]{3})"',
-                r'"priceCurrency"\s*:\s*"([A-Z]{3})"',
-            ]
-            
-            for pattern in price_patterns:
-                match = re.search(pattern, script.string)
-                if match:
-                    try:
-                        price = Decimal(match.group(1))
-                        currency = 'USD'
-                        
-                        for curr_pattern in currency_patterns:
-                            curr_match = re.search(curr_pattern, script.string)
-                            if curr_match:
-                                currency = curr_match.group(1)
-                                break
-                        
-                        if price > 0:
-                            return (price, currency)
-                    except:
-                        continue
+            result = price_matcher.match_script(script.string)
+            if result:
+                return result
         
         return None
     
@@ -215,7 +186,7 @@ class ScraperService:
         name_sources = [
             soup.find('meta', {'property': 'og:title'}),
             soup.find('meta', {'name': 'twitter:title'}),
-            soup.find('h1', {'class': re.compile(r'product', re.I)}),
+            soup.find('h1', {'class': self.PRODUCT_PATTERN}),
             soup.find('h1'),
             soup.find('title'),
         ]
@@ -234,8 +205,8 @@ class ScraperService:
         image_sources = [
             soup.find('meta', {'property': 'og:image'}),
             soup.find('meta', {'name': 'twitter:image'}),
-            soup.find('img', {'class': re.compile(r'product', re.I)}),
-            soup.find('img', {'id': re.compile(r'product', re.I)}),
+            soup.find('img', {'class': self.PRODUCT_PATTERN}),
+            soup.find('img', {'id': self.PRODUCT_PATTERN}),
             soup.find('img', {'itemprop': 'image'}),
         ]
         
@@ -262,18 +233,33 @@ class ScraperService:
                     user_agent=self._get_user_agent()
                 )
                 
+                requests_seen = None
+                if settings.PLAYWRIGHT_BLOCK_RESOURCES:
+                    from app.services.render_policy import render_policy
+                    requests_seen = render_policy.install(page, url)
+                
                 page.goto(url, wait_until='domcontentloaded', timeout=15000)
                 time.sleep(2)
                 
                 content = page.content()
                 browser.close()
                 
-                soup = BeautifulSoup(content, 'lxml')
-                return self._extract_from_soup(soup, url)
+                if requests_seen:
+                    metrics.increment('playwright_requests_total', requests_seen['allowed'], labels={'action': 'allowed'})
+                    metrics.increment('playwright_requests_total', requests_seen['blocked'], labels={'action': 'blocked'})
+                
+                return self._extract(content, url)
         except Exception as e:
             logger.error(f"Playwright scraping failed for {url}: {str(e)}")
             return None
     
+    def _extract(self, content, url: str) -> Optional[Dict]:
+        """Extract with the host's site rule when it has one, otherwise with the generic cascade."""
+        rule = site_rules.lookup(urlsplit(url).hostname)
+        if rule is not None:
+            return rule.extract(content, url)
+        return self._extract_from_soup(BeautifulSoup(content, 'lxml'), url)
+    
     def _extract_from_soup(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         price_result = (
             self._extract_price_from_meta(soup) or
@@ -296,7 +282,52 @@ class ScraperService:
         
         return None
     
+    def _fetch_streaming(self, url: str, headers: Dict) -> bytes:
+        """Read the body incrementally, stopping once the page is confident or SCRAPER_MAX_BYTES is reached.
+
+        Pages of hosts with a site rule are read to the end or the cap: the
+        rule's selectors usually target the body, past the head signals
+        PageSignals is confident from.
+        """
+        parser = None
+        if site_rules.lookup(urlsplit(url).hostname) is None:
+            signals = PageSignals(self._extract_price_from_json_data)
+            parser = etree.HTMLParser(target=signals)
+        chunks = []
+        size = 0
+        reason = 'eof'
+        
+        with self.session.get(url, headers=headers, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=settings.SCRAPER_CHUNK_BYTES):
+                chunks.append(chunk)
+                size += len(chunk)
+                if parser is not None:
+                    parser.feed(chunk)
+                    if signals.confident:
+                        reason = 'confident'
+                        break
+                if size >= settings.SCRAPER_MAX_BYTES:
+                    reason = 'cap'
+                    break
+            
+            wire_bytes = response.raw.tell()
+            content_length = response.headers.get('Content-Length')
+        
+        metrics.increment('scraper_fetches_total', labels={'stop': reason})
+        metrics.increment('scraper_bytes_read_total', wire_bytes)
+        if content_length and content_length.isdigit():
+            saved = max(int(content_length) - wire_bytes, 0)
+            metrics.increment('scraper_bytes_saved_total', saved)
+            metrics.observe('scraper_bytes_saved_per_check', saved, buckets=BYTE_BUCKETS)
+        
+        return b''.join(chunks)
+    
     def scrape_product(self, url: str) -> Dict:
+        with track('scrape'):
+            return self._scrape_product(url)
+
+    def _scrape_product(self, url: str) -> Dict:
         try:
             headers = {
                 'User-Agent': self._get_user_agent(),
@@ -308,21 +339,24 @@ class ScraperService:
                 'Cache-Control': 'max-age=0',
             }
             
-            response = self.session.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            if settings.SCRAPER_STREAMING_ENABLED:
+                content = self._fetch_streaming(url, headers)
+            else:
+                response = self.session.get(url, headers=headers, timeout=15)
+                response.raise_for_status()
+                content = response.content
             
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            result = self._extract_from_soup(soup, url)
+            result = parse_pool.extract(content, url)
             
             if result:
                 return result
             
-            logger.info(f"Basic scraping failed for {url}, trying Playwright...")
-            result = self._try_playwright_scraping(url)
-            
-            if result:
-                return result
+            if self.archive_mode != 'replay':
+                logger.info(f"Basic scraping failed for {url}, trying Playwright...")
+                result = self._try_playwright_scraping(url)
+                
+                if result:
+                    return result
             
             raise ValueError("Could not extract price from the page. The site may require manual price entry or uses advanced anti-scraping measures.")
             
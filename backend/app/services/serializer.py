@@ -0,0 +1,34 @@
+from decimal import Decimal
+from typing import Sequence, Iterable
+import orjson
+from fastapi.responses import ORJSONResponse
+from app.services.profiler import track
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    with track('serialization'):
+        return orjson.dumps(content, default=_default)
+
+
+def dumps_rows(columns: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """Serialize column tuples as a JSON array of objects without building models.
+
+    Decimals are written as strings and naive datetimes in ISO 8601, matching
+    the output of the pydantic response schemas.
+    """
+    with track('serialization'):
+        return orjson.dumps([dict(zip(columns, row)) for row in rows], default=_default)
+
+
+class ProfiledORJSONResponse(ORJSONResponse):
+    """ORJSONResponse whose render time is charged to the request profile."""
+
+    def render(self, content) -> bytes:
+        with track('serialization'):
+            return super().render(content)
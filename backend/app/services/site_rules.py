@@ -0,0 +1,209 @@
+"""Per-site extraction rules loaded from JSON files in SCRAPER_RULES_DIR.
+
+Each file holds one rule or a list of them:
+
+    {
+        "domains": ["shop.example", "www.shop.example"],
+        "price": [{"css": "span.price-now"}, {"json": "offers.price"}],
+        "name": [{"xpath": "//h1[@id='title']"}],
+        "image": [{"css": "meta[property='og:image']", "attr": "content"}],
+        "currency": "EUR",
+        "decimal_separator": ","
+    }
+
+Each field lists sources tried in order. A source selects elements with
+"css" or "xpath" and reads "attr" or the element text; with "json" the
+selected elements (JSON-LD scripts by default) are parsed, including the
+object literal of a `window.x = {...}` assignment, and the dotted path is
+followed, with integer segments indexing lists. "currency" is a fixed code
+or a source list like the others; without it the currency is detected from
+the price text.
+"""
+import json
+import os
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+from app.config import settings
+from app.services.price_matcher import price_matcher
+import logging
+
+logger = logging.getLogger(__name__)
+
+JSON_LD_SELECTOR = "script[type='application/ld+json']"
+NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+CURRENCY_CODE = re.compile(r'[A-Z]{3}')
+
+
+def _walk(data, path: List[str]):
+    for key in path:
+        if isinstance(data, list):
+            if key.isdigit():
+                data = data[int(key)] if int(key) < len(data) else None
+            else:
+                data = next((found for found in (_walk(item, [key]) for item in data) if found is not None), None)
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+        if data is None:
+            return None
+    return data
+
+
+def _load_json(text: str):
+    """Parse a JSON script body, or the object literal in a `window.__STATE__ = {...};` assignment."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        return json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+
+
+def _compile_source(source: Dict) -> Callable:
+    """Turn one source spec into a function from a parsed page to a list of string values."""
+    if not isinstance(source, dict) or not source.keys() & {'css', 'xpath', 'json'}:
+        raise ValueError(f"Source needs a 'css', 'xpath' or 'json' key: {source!r}")
+    if 'xpath' in source:
+        select = etree.XPath(source['xpath'])
+    else:
+        select = CSSSelector(source.get('css', JSON_LD_SELECTOR if 'json' in source else None))
+    attr = source.get('attr')
+
+    if 'json' in source:
+        path = source['json'].split('.')
+
+        def read(tree) -> List[str]:
+            values = []
+            for element in select(tree):
+                data = _load_json(element.text or '')
+                if data is None:
+                    continue
+                found = _walk(data, path)
+                if found is not None and not isinstance(found, (dict, list)):
+                    values.append(str(found))
+            return values
+        return read
+
+    def read(tree) -> List[str]:
+        values = []
+        for found in select(tree):
+            if isinstance(found, str):
+                value = found
+            elif attr:
+                value = found.get(attr)
+            else:
+                value = found.text_content()
+            if value and value.strip():
+                values.append(value.strip())
+        return values
+    return read
+
+
+class SiteRule:
+    """Compiled selectors for one site; extraction never falls back to the generic heuristics."""
+
+    def __init__(self, spec: Dict):
+        if not isinstance(spec, dict) or not spec.get('domains') or not spec.get('price'):
+            raise ValueError("Rule needs non-empty 'domains' and 'price' lists")
+        self.domains = [domain.lower() for domain in spec['domains']]
+        self.price = [_compile_source(source) for source in spec['price']]
+        self.name = [_compile_source(source) for source in spec.get('name', [])]
+        self.image = [_compile_source(source) for source in spec.get('image', [])]
+        currency = spec.get('currency')
+        self.fixed_currency = currency if isinstance(currency, str) else None
+        self.currency = [_compile_source(source) for source in currency] if isinstance(currency, list) else []
+        self.decimal_separator = spec.get('decimal_separator', '.')
+
+    @staticmethod
+    def _first(sources: List[Callable], tree) -> Optional[str]:
+        for source in sources:
+            values = source(tree)
+            if values:
+                return values[0]
+        return None
+
+    def _parse_price(self, value: str) -> Optional[tuple]:
+        """First number in the value, read with the site's decimal separator, and the currency it mentions."""
+        if self.decimal_separator != '.':
+            value = value.replace('.', '').replace(self.decimal_separator, '.')
+        match = NUMBER.search(value)
+        if not match:
+            return None
+        try:
+            return Decimal(match.group().replace(',', '')), price_matcher.detect_currency(value)
+        except InvalidOperation:
+            return None
+
+    def extract(self, content: bytes, url: str) -> Optional[Dict]:
+        tree = html.fromstring(content, base_url=url)
+        for source in self.price:
+            parsed = next(filter(None, (self._parse_price(value) for value in source(tree))), None)
+            if parsed and parsed[0] > 0:
+                break
+        else:
+            return None
+
+        price, detected = parsed
+        currency = self.fixed_currency or self._first(self.currency, tree)
+        if not currency or not CURRENCY_CODE.fullmatch(currency.upper()):
+            currency = detected or 'USD'
+
+        name = self._first(self.name, tree)
+        image_url = self._first(self.image, tree)
+        return {
+            'price': price,
+            'name': name[:500] if name else None,
+            'image_url': urljoin(url, image_url) if image_url else None,
+            'currency': currency.upper(),
+        }
+
+
+class SiteRulesRegistry:
+    """Host -> SiteRule map built once per process from the rule files."""
+
+    def __init__(self, rules_dir: str):
+        self.rules_dir = rules_dir
+        self.by_host: Dict[str, SiteRule] = {}
+        self.load()
+
+    def load(self):
+        """Build the host map; a file that fails to parse or compile is logged and skipped as a whole."""
+        by_host = {}
+        if os.path.isdir(self.rules_dir):
+            for filename in sorted(os.listdir(self.rules_dir)):
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(self.rules_dir, filename)
+                try:
+                    with open(path) as f:
+                        specs = json.load(f)
+                    rules = [SiteRule(spec) for spec in (specs if isinstance(specs, list) else [specs])]
+                except Exception as e:
+                    logger.error(f"Skipping extraction rules file {path}: {str(e)}")
+                    continue
+                for rule in rules:
+                    by_host.update((domain, rule) for domain in rule.domains)
+        self.by_host = by_host
+        logger.info(f"Loaded extraction rules for {len(by_host)} hosts from {self.rules_dir}")
+
+    def lookup(self, host: str) -> Optional[SiteRule]:
+        """Exact host first, then each parent domain, so www.shop.example matches a shop.example rule."""
+        host = (host or '').lower()
+        while host:
+            rule = self.by_host.get(host)
+            if rule is not None:
+                return rule
+            _, _, host = host.partition('.')
+        return None
+
+site_rules = SiteRulesRegistry(settings.SCRAPER_RULES_DIR)
@@ -0,0 +1,32 @@
+import struct
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional, List, Dict
+
+# Each point is a little-endian (uint32 epoch seconds, int64 price in cents) pair.
+POINT = struct.Struct('<Iq')
+
+
+def pack_points(points: List[tuple]) -> bytes:
+    return b''.join(
+        POINT.pack(int(recorded_at.replace(tzinfo=timezone.utc).timestamp()), int(Decimal(price) * 100))
+        for recorded_at, price in points
+    )
+
+
+def unpack_points(blob: Optional[bytes]) -> List[Dict]:
+    if not blob:
+        return []
+    return [
+        {
+            'price': Decimal(cents).scaleb(-2),
+            'recorded_at': datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=None),
+        }
+        for seconds, cents in POINT.iter_unpack(blob)
+    ]
+
+
+def append_point(blob: Optional[bytes], price, recorded_at: datetime, max_points: int) -> bytes:
+    """Append a price to a packed ring buffer, keeping only the newest max_points entries."""
+    blob = (blob or b'') + pack_points([(recorded_at, price)])
+    return blob[-max_points * POINT.size:]
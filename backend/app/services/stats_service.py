@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.price_history import PriceHistory
+from app.schemas.stats import PriceStatsWindow
+
+STATS_WINDOWS = [
+    ('7d', timedelta(days=7)),
+    ('30d', timedelta(days=30)),
+    ('90d', timedelta(days=90)),
+    ('all', None),
+]
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def _round(value) -> float:
+    return round(float(value), 2)
+
+
+def window_stats(window: str, prices: np.ndarray, current: Optional[float]) -> Dict:
+    if prices.size == 0:
+        return PriceStatsWindow(window=window, count=0).model_dump()
+
+    low, high = prices.min(), prices.max()
+    p10, p25, p50, p75, p90 = np.percentile(prices, PERCENTILES)
+    stats = {
+        'window': window,
+        'count': int(prices.size),
+        'min': _round(low),
+        'max': _round(high),
+        'mean': _round(prices.mean()),
+        'p10': _round(p10),
+        'p25': _round(p25),
+        'p50': _round(p50),
+        'p75': _round(p75),
+        'p90': _round(p90),
+    }
+
+    if current is not None:
+        stats['current_percentile_rank'] = _round(np.count_nonzero(prices <= current) * 100.0 / prices.size)
+        stats['drop_percent'] = _round((high - current) * 100.0 / high) if high > 0 else 0.0
+    return stats
+
+
+def price_stats(prices: np.ndarray, recorded_at: np.ndarray, current: Optional[float], now: datetime) -> List[Dict]:
+    results = []
+    for window, span in STATS_WINDOWS:
+        if span is None:
+            selected = prices
+        else:
+            selected = prices[recorded_at >= np.datetime64(now - span)]
+        results.append(window_stats(window, selected, current))
+    return results
+
+
+class StatsService:
+    def for_products(self, db: Session, products: List[Product], now: Optional[datetime] = None) -> List[Dict]:
+        """Compute windowed statistics for several products from a single history query."""
+        now = now or datetime.utcnow()
+        if not products:
+            return []
+
+        rows = db.execute(
+            select(PriceHistory.catalog_item_id, PriceHistory.price, PriceHistory.recorded_at).where(
+                PriceHistory.catalog_item_id.in_({product.catalog_item_id for product in products})
+            ).order_by(PriceHistory.catalog_item_id)
+        ).all()
+
+        if rows:
+            item_ids, prices, recorded_at = zip(*rows)
+            item_ids = np.fromiter(item_ids, dtype=np.int64, count=len(rows))
+            prices = np.array(prices, dtype=np.float64)
+            recorded_at = np.array(recorded_at, dtype='datetime64[us]')
+        else:
+            item_ids = np.empty(0, dtype=np.int64)
+            prices = np.empty(0, dtype=np.float64)
+            recorded_at = np.empty(0, dtype='datetime64[us]')
+
+        unique_ids, starts = np.unique(item_ids, return_index=True)
+        bounds = dict(zip(unique_ids.tolist(), zip(starts.tolist(), starts[1:].tolist() + [len(rows)])))
+
+        results = []
+        for product in products:
+            start, end = bounds.get(product.catalog_item_id, (0, 0))
+            product_prices = prices[start:end]
+            if product.current_price is not None:
+                current = float(product.current_price)
+            elif end > start:
+                current = float(product_prices[np.argmax(recorded_at[start:end])])
+            else:
+                current = None
+
+            results.append({
+                'product_id': product.id,
+                'current_price': product.current_price,
+                'currency': product.currency,
+                'windows': price_stats(product_prices, recorded_at[start:end], current, now),
+            })
+        return results
+
+stats_service = StatsService()
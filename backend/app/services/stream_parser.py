@@ -0,0 +1,94 @@
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, List, Optional, Tuple
+
+# In the order the extractor tries them
+PRICE_META = [
+    ('property', 'og:price:amount'),
+    ('property', 'product:price:amount'),
+    ('property', 'og:price'),
+    ('name', 'price'),
+    ('itemprop', 'price'),
+]
+NAME_META = [('property', 'og:title'), ('name', 'twitter:title')]
+IMAGE_META = [('property', 'og:image'), ('name', 'twitter:image')]
+WATCHED_META = set(PRICE_META + NAME_META + IMAGE_META)
+
+
+class PageSignals:
+    """lxml parser target that watches a page as it streams in for the fields a scrape needs.
+
+    The page is confident once the head has closed and it has carried a
+    structured price (price meta tag or JSON-LD offer) plus the og/twitter
+    title and image. These are the top-ranked sources the full extraction
+    would use, so parsing only the bytes read so far gives the same result.
+    Like the extractor, only the first tag of each meta key counts, and it
+    must hold a value the extractor accepts: a positive price, a non-blank
+    title and an absolute or root-relative image URL. Product meta tags are
+    assumed to sit in the head.
+    """
+
+    def __init__(self, json_ld_price: Callable[[object], Optional[tuple]]):
+        self._json_ld_price = json_ld_price
+        self._script: Optional[List[str]] = None
+        self._meta: Dict[Tuple[str, str], str] = {}
+        self.has_price = False
+        self.has_name = False
+        self.has_image = False
+        self.head_closed = False
+
+    @property
+    def confident(self) -> bool:
+        return self.head_closed and self.has_price and self.has_name and self.has_image
+
+    def start(self, tag, attrib):
+        if tag == 'meta':
+            for attr in ('property', 'name', 'itemprop'):
+                key = (attr, attrib.get(attr))
+                if key in WATCHED_META and key not in self._meta:
+                    self._meta[key] = attrib.get('content') or ''
+            self.has_price = self.has_price or self._meta_price()
+            self.has_name = self.has_name or any(self._meta.get(key, '').strip() for key in NAME_META)
+            self.has_image = self.has_image or any(
+                self._meta.get(key, '').startswith(('http', '//', '/')) for key in IMAGE_META
+            )
+        elif tag == 'script' and attrib.get('type') == 'application/ld+json':
+            self._script = []
+        elif tag == 'body':
+            self.head_closed = True
+
+    def data(self, text):
+        if self._script is not None:
+            self._script.append(text)
+
+    def end(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+        elif tag == 'script' and self._script is not None:
+            if not self.has_price:
+                self.has_price = self._check_json_ld(''.join(self._script))
+            self._script = None
+
+    def close(self):
+        return None
+
+    def _meta_price(self) -> bool:
+        """Mirror the extractor: the first price key with parseable content decides."""
+        for key in PRICE_META:
+            content = self._meta.get(key)
+            if not content:
+                continue
+            try:
+                price = Decimal(content)
+            except (InvalidOperation, ValueError):
+                continue
+            return price > 0
+        return False
+
+    def _check_json_ld(self, text: str) -> bool:
+        try:
+            data = json.loads(text)
+            items = data if isinstance(data, list) else [data]
+            return any(self._json_ld_price(item) for item in items)
+        except Exception:
+            return False
@@ -1,12 +1,15 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.config import settings
+from app.database import configure_worker_engine
+from app.services.parse_pool import parse_pool
 
 celery_app = Celery(
     "pricedrop",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=['app.tasks.price_checker']
+    include=['app.tasks.price_checker', 'app.tasks.retention', 'app.tasks.history']
 )
 
 celery_app.conf.update(
@@ -20,8 +23,31 @@ celery_app.conf.update(
             'task': 'app.tasks.price_checker.check_prices',
             'schedule': 300.0,
         },
+        'enforce-history-retention-daily': {
+            'task': 'app.tasks.retention.enforce_history_retention',
+            'schedule': crontab(hour=3, minute=0),
+        },
     },
 )
 
+if settings.HISTORY_WRITE_BEHIND:
+    celery_app.conf.beat_schedule['write-price-history'] = {
+        'task': 'app.tasks.history.write_price_history',
+        'schedule': float(settings.HISTORY_WRITER_INTERVAL_SECONDS),
+    }
+
+@worker_process_init.connect
+def init_worker_db(**kwargs):
+    configure_worker_engine()
+
+@worker_process_init.connect
+def init_parse_pool(**kwargs):
+    if settings.SCRAPER_PARSE_POOL_ENABLED:
+        parse_pool.enable()
+
+@worker_process_shutdown.connect
+def shutdown_parse_pool(**kwargs):
+    parse_pool.shutdown()
+
 if __name__ == '__main__':
     celery_app.start()
@@ -0,0 +1,27 @@
+from app.tasks.celery_app import celery_app
+from app.tasks.price_checker import DatabaseTask
+from app.config import settings
+from app.services.history_writer import history_writer
+from app.services.cache_service import response_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def write_price_history(self):
+    db = self.db
+
+    try:
+        result = history_writer.drain(db, settings.HISTORY_WRITER_MAX_SECONDS)
+        response_cache.invalidate_users(result['user_ids'])
+        status = result['lag']
+        logger.info(
+            f"History writer applied {result['applied']} observations; "
+            f"lag={status['lag']} pending={status['pending']} oldest={status['oldest_age_seconds']}"
+        )
+        return {'applied': result['applied'], **status}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in write_price_history task: {str(e)}")
+        raise
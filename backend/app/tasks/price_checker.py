@@ -1,17 +1,49 @@
 from celery import Task
 from datetime import datetime
-from sqlalchemy import func, text
+from sqlalchemy import func, select, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from app.tasks.celery_app import celery_app
 from app.database import SessionLocal
+from app.models.catalog_item import CatalogItem
 from app.models.product import Product
 from app.models.price_alert import PriceAlert
-from app.models.price_history import PriceHistory
-from app.services.scraper_service import scraper_service
+from app.services.scraper_client import get_scraper
 from app.services.email_service import email_service
+from app.services.cache_service import response_cache
+from app.services.catalog_service import catalog_service
+from app.services.event_service import event_publisher
+from app.services.alert_service import alert_service
+from app.services.history_writer import history_writer
 import logging
 
 logger = logging.getLogger(__name__)
 
+class minutes_after(FunctionElement):
+    """`timestamp + minutes` computed by the database, in each dialect's own date arithmetic."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(minutes_after)
+def _minutes_after_default(element, compiler, **kw):
+    timestamp, minutes = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"({timestamp} + {minutes} * INTERVAL '1 minute')"
+
+
+@compiles(minutes_after, 'mysql')
+def _minutes_after_mysql(element, compiler, **kw):
+    timestamp, minutes = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"DATE_ADD({timestamp}, INTERVAL {minutes} MINUTE)"
+
+
+@compiles(minutes_after, 'sqlite')
+def _minutes_after_sqlite(element, compiler, **kw):
+    timestamp, minutes = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"datetime({timestamp}, '+' || {minutes} || ' minutes')"
+
+
 # -----------------------------
 # Base Celery Task with DB
 # -----------------------------
@@ -40,74 +72,122 @@ def check_prices(self):
     try:
         now = datetime.utcnow()
 
-        # ✅ FIX: Do datetime math in MySQL, not Python
-        products = db.query(Product).filter(
-            Product.is_active == True,
-            (
-                Product.last_checked_at.is_(None)
-                |
-                func.date_add(
-                    Product.last_checked_at,
-                    text("INTERVAL check_interval_minutes MINUTE")
-                ) <= now
-            )
-        ).all()
+        # Each catalog item is scraped once per run, on the shortest interval
+        # any of its active subscribers asked for
+        intervals = select(
+            Product.catalog_item_id,
+            func.min(Product.check_interval_minutes).label("check_interval_minutes")
+        ).where(Product.is_active == True).group_by(Product.catalog_item_id).subquery("intervals")
+
+        # ✅ FIX: Do datetime math in the database, not Python
+        due = select(CatalogItem.id).join(
+            intervals, intervals.c.catalog_item_id == CatalogItem.id
+        ).where(
+            CatalogItem.last_checked_at.is_(None)
+            |
+            (minutes_after(CatalogItem.last_checked_at, intervals.c.check_interval_minutes) <= now)
+        )
+
+        items = db.query(CatalogItem).filter(CatalogItem.id.in_(due)).all()
 
-        logger.info(f"Checking prices for {len(products)} products")
+        subscribers = {}
+        for product_id, user_id, item_id in db.query(
+            Product.id, Product.user_id, Product.catalog_item_id
+        ).filter(Product.is_active == True, Product.catalog_item_id.in_(due)):
+            subscribers.setdefault(item_id, {})[product_id] = user_id
 
-        for product in products:
+        logger.info(f"Checking prices for {len(items)} catalog items")
+
+        touched_users = set()
+        events = []
+        notifications = []
+        observations = []
+
+        # The whole run is scraped as one batch, in-process or by the
+        # scraping service; results are applied to the session sequentially
+        scraped = get_scraper().scrape_many([item.url for item in items])
+        queued_prices = history_writer.last_prices([item.id for item in items]) if history_writer.enabled else {}
+
+        for item, (scraped_data, error) in zip(items, scraped):
             try:
-                scraped_data = scraper_service.scrape_product(product.url)
+                if error is not None:
+                    raise Exception(error)
                 new_price = scraped_data["price"]
-
-                # Save price history if price changed
-                if new_price != product.current_price:
-                    history = PriceHistory(
-                        product_id=product.id,
-                        price=new_price,
-                        recorded_at=now
-                    )
-                    db.add(history)
-                    product.current_price = new_price
+                item_subscribers = subscribers.get(item.id, {})
+
+                if history_writer.enabled:
+                    # Catalog and history rows are left to the history writer,
+                    # so the row may still lag observations already queued
+                    price_changed = new_price != queued_prices.get(item.id, item.current_price)
+                    observations.append((item.id, new_price, now))
+                else:
+                    price_changed = catalog_service.record_price(db, item, new_price, now)
+
+                if price_changed:
+                    for product_id, user_id in item_subscribers.items():
+                        events.append((user_id, {
+                            "type": "price_changed",
+                            "product_id": product_id,
+                            "price": str(new_price),
+                            "recorded_at": now.isoformat(),
+                        }))
 
                     logger.info(
-                        f"Price updated for product {product.id}: {new_price}"
+                        f"Price updated for catalog item {item.id}: {new_price}"
                     )
 
-                product.last_checked_at = now
-
-                # Fetch active alerts
-                active_alerts = db.query(PriceAlert).filter(
-                    PriceAlert.product_id == product.id,
-                    PriceAlert.is_active == True,
-                    PriceAlert.triggered_at.is_(None)
-                ).all()
+                touched_users.update(item_subscribers.values())
+
+                # Every alert type is stored as a trigger price, so only
+                # alerts at or above the new price need to be loaded
+                for alert in alert_service.pending_triggered(db, item.id, new_price):
+                    alert.triggered_at = now
+
+                    notifications.append({
+                        "product_id": alert.product_id,
+                        "alert_id": alert.id,
+                        "current_price": float(new_price),
+                    })
+
+                    events.append((item_subscribers.get(alert.product_id), {
+                        "type": "alert_triggered",
+                        "product_id": alert.product_id,
+                        "alert_id": alert.id,
+                        "alert_type": alert.alert_type,
+                        "price": str(new_price),
+                        "target_price": str(alert.target_price),
+                        "triggered_at": now.isoformat(),
+                    }))
 
-                for alert in active_alerts:
-                    if new_price <= alert.target_price:
-                        alert.triggered_at = now
-
-                        send_email_notification.delay(
-                            product_id=product.id,
-                            alert_id=alert.id,
-                            current_price=float(new_price)
-                        )
+                    logger.info(
+                        f"Alert {alert.id} triggered for product {alert.product_id}"
+                    )
 
-                        logger.info(
-                            f"Alert {alert.id} triggered for product {product.id}"
-                        )
+                if price_changed:
+                    alert_service.relevel_after_check(db, item.id, new_price)
 
             except Exception as e:
                 logger.error(
-                    f"Error checking product {product.id}: {str(e)}"
+                    f"Error checking catalog item {item.id}: {str(e)}"
                 )
                 continue
 
+        # Queued before the commit so a failed append leaves alerts untriggered
+        # and the items due again, rather than losing the observations
+        history_writer.append_many(observations)
+
         # ✅ Single commit at the end (IMPORTANT)
         db.commit()
+        response_cache.invalidate_users(touched_users)
+        event_publisher.publish_many(events)
+
+        # Only alerts whose triggered_at is committed are notified, so a
+        # failed run that retriggers them later does not email twice
+        for notification in notifications:
+            send_email_notification.delay(**notification)
 
         logger.info(
-            f"Price check completed for {len(products)} products"
+            f"Price check completed for {len(items)} catalog items"
         )
 
     except Exception as e:
@@ -0,0 +1,27 @@
+from app.tasks.celery_app import celery_app
+from app.tasks.price_checker import DatabaseTask
+from app.services.retention_service import retention_service
+from app.services.cache_service import response_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def enforce_history_retention(self):
+    db = self.db
+
+    try:
+        result = retention_service.enforce(db)
+        if result['archived']:
+            response_cache.invalidate_all()
+        logger.info(
+            f"History retention completed: archived {len(result['archived'])} months, "
+            f"created {len(result['partitions_created'])} partitions, "
+            f"purged {result['orphans_purged']} unsubscribed catalog items"
+        )
+        return result
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in enforce_history_retention task: {str(e)}")
+        raise
@@ -0,0 +1,71 @@
+"""Time POST /products/import for many URLs served by a local stub retailer.
+
+Usage: python -m benchmarks.bench_bulk_import [--rows 1000]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+PAGE = """<html><head>
+<meta property="og:title" content="Stub product {path}">
+<meta property="og:price:amount" content="{price}">
+<meta property="og:price:currency" content="USD">
+<meta property="og:image" content="https://example.com/{path}.jpg">
+</head><body><h1>Stub product</h1></body></html>"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.format(path=self.path.strip('/'), price=100 + len(self.path)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import Base, SessionLocal, engine
+    from app.services.auth_service import get_or_create_user, create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = get_or_create_user(db, google_id='bench', email='bench@example.com', name='Bench', profile_picture='')
+    token = create_access_token(data={"user_id": user.id, "email": user.email})
+    db.close()
+
+    items = [{"url": f"{base_url}/item-{i}", "target_price": "50.00"} for i in range(args.rows)]
+    client = TestClient(app)
+
+    started = time.perf_counter()
+    response = client.post("/products/import", json={"items": items}, headers={"Authorization": f"Bearer {token}"})
+    elapsed = time.perf_counter() - started
+
+    body = response.json()
+    print(f"status={response.status_code} rows={args.rows} created={body.get('created')} "
+          f"failed={body.get('failed')} elapsed={elapsed:.2f}s rate={args.rows / elapsed:.0f} rows/s")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare GET /dashboard/summary against GET /products plus one history call per product.
+
+Usage: python -m benchmarks.bench_dashboard_summary [--sizes 10,50,200] [--points 100]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+
+def median_ms(fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10,50,200')
+    parser.add_argument('--points', type=int, default=100)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import Base, SessionLocal, engine
+    from app.models import CatalogItem, Product, PriceAlert, PriceHistory
+    from app.services.catalog_service import url_hash
+    from app.services.auth_service import get_or_create_user, create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    client = TestClient(app)
+    start = datetime(2026, 1, 1)
+
+    print(f"{'products':>8} {'summary ms':>11} {'per-product ms':>15} {'ratio':>6}")
+    for index, size in enumerate(int(value) for value in args.sizes.split(',')):
+        db = SessionLocal()
+        user = get_or_create_user(db, google_id=f'bench-{index}', email=f'bench-{index}@example.com', name='Bench', profile_picture='')
+        for p in range(size):
+            url = f'https://example.com/{index}/{p}'
+            item = CatalogItem(url=url, url_hash=url_hash(url), name=f'Item {p}', current_price=Decimal('99.99'))
+            db.add(item)
+            db.flush()
+            product = Product(user_id=user.id, catalog_item_id=item.id)
+            db.add(product)
+            db.flush()
+            db.add(PriceAlert(product_id=product.id, target_price=Decimal('50.00')))
+            db.bulk_insert_mappings(PriceHistory, [
+                {'catalog_item_id': item.id, 'price': Decimal('120.00') - i % 30, 'recorded_at': start + timedelta(hours=i)}
+                for i in range(args.points)
+            ])
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'user_id': user.id, 'email': user.email})}"}
+        db.close()
+
+        def summary():
+            assert client.get("/dashboard/summary", headers=headers).status_code == 200
+
+        def per_product():
+            products = client.get("/products", headers=headers).json()
+            for product in products:
+                client.get(f"/products/{product['id']}/history?limit=20", headers=headers)
+
+        summary_ms = median_ms(summary)
+        per_product_ms = median_ms(per_product)
+        print(f"{size:>8} {summary_ms:>11.1f} {per_product_ms:>15.1f} {per_product_ms / summary_ms:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Compare the legacy and column-tuple serialization paths for a 10k-point history.
+
+Usage: python -m benchmarks.bench_history_serialization [--points 10000] [--repeat 20]
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return body, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import select, literal, Integer
+    from app.database import Base, engine, SessionLocal
+    from app.models import User, CatalogItem, Product, PriceHistory
+    from app.schemas.alert import PriceHistoryResponse
+    from app.routes.history import HISTORY_FIELDS, _history_columns
+    from app.services.serializer import dumps_rows
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(google_id='bench', email='bench@example.com')
+    db.add(user)
+    db.flush()
+    item = CatalogItem(url='https://example.com/item', url_hash='bench')
+    db.add(item)
+    db.flush()
+    product = Product(user_id=user.id, catalog_item_id=item.id)
+    db.add(product)
+    db.flush()
+    start = datetime(2025, 1, 1)
+    db.bulk_insert_mappings(PriceHistory, [
+        {'catalog_item_id': item.id, 'price': Decimal('199.99') - i % 50, 'recorded_at': start + timedelta(minutes=15 * i)}
+        for i in range(args.points)
+    ])
+    db.commit()
+
+    def legacy():
+        rows = db.query(PriceHistory).filter(PriceHistory.catalog_item_id == item.id).order_by(
+            PriceHistory.recorded_at.desc()
+        ).all()
+        models = [
+            PriceHistoryResponse(id=row.id, product_id=product.id, price=row.price, recorded_at=row.recorded_at)
+            for row in rows
+        ]
+        db.expunge_all()
+        return json.dumps(jsonable_encoder(models)).encode()
+
+    def optimized():
+        rows = db.execute(
+            select(*_history_columns(literal(product.id, Integer))).where(PriceHistory.catalog_item_id == item.id).order_by(
+                PriceHistory.recorded_at.desc()
+            )
+        ).all()
+        return dumps_rows(HISTORY_FIELDS, rows)
+
+    legacy_body, legacy_ms = timed(legacy, args.repeat)
+    optimized_body, optimized_ms = timed(optimized, args.repeat)
+    assert json.loads(legacy_body) == json.loads(optimized_body)
+
+    print(f"points={args.points}")
+    print(f"legacy     median={legacy_ms:8.2f} ms  bytes={len(legacy_body)}")
+    print(f"optimized  median={optimized_ms:8.2f} ms  bytes={len(optimized_body)}  "
+          f"gzip={len(gzip.compress(optimized_body))}  speedup={legacy_ms / optimized_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
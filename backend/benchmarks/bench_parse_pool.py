@@ -0,0 +1,70 @@
+"""Measure check throughput with parsing inline versus in the parse pool.
+
+Fetch threads sleep for a simulated network latency and then hand the
+synthetic page to the extractor, the same split price checks use. With
+inline parsing every thread competes for the GIL while parsing; the pool
+moves that work to separate processes.
+
+Usage: python -m benchmarks.bench_parse_pool [--pages 400] [--threads 8] [--latency-ms 50]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+
+def run(extract, pages, threads, latency):
+    def check(page):
+        url, body = page
+        time.sleep(latency)
+        return extract(body, url)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(check, pages))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--max-pending', type=int, default=64)
+    args = parser.parse_args()
+
+    from app.services.parse_pool import ParsePool, _extract_in_worker
+    from benchmarks.bench_replay_scrape import synthetic_page
+
+    pages = [(f'https://shop{i % 4}.example/product/{i}', synthetic_page(i)) for i in range(args.pages)]
+    latency = args.latency_ms / 1000
+    cpus = os.cpu_count() or 1
+    print(f"pages={len(pages)} threads={args.threads} latency={args.latency_ms:.0f} ms cpus={cpus}")
+
+    expected, elapsed = run(_extract_in_worker, pages, args.threads, latency)
+    print(f"inline       elapsed={elapsed:6.2f}s  rate={len(pages) / elapsed:7.1f} pages/s")
+
+    workers = 1
+    while True:
+        pool = ParsePool(workers, args.max_pending)
+        pool.enable()
+        try:
+            # Warm the pool so process start-up is not counted
+            run(pool.extract, pages[:workers * 4], workers * 4, 0)
+            results, elapsed = run(pool.extract, pages, args.threads, latency)
+        finally:
+            pool.shutdown()
+        assert results == expected, f"pool with {workers} workers extracted different fields"
+        print(f"pool[{workers:>2}]     elapsed={elapsed:6.2f}s  rate={len(pages) / elapsed:7.1f} pages/s")
+        if workers >= cpus:
+            break
+        workers = min(workers * 2, cpus)
+
+
+if __name__ == '__main__':
+    main()
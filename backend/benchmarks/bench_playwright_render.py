@@ -0,0 +1,157 @@
+"""Compare full and resource-blocked Playwright renders of a local product fixture page.
+
+The fixture is served from two loopback addresses. 127.0.0.1 hosts the page,
+its images, fonts, stylesheets, video and the script that renders the price;
+127.0.0.2 plays the third-party tracker and is added to the tracker domains
+for the blocked run. Reports median render time, JS heap, the Chromium
+process tree's RSS and the requests made, and checks both modes extract the
+same price.
+
+Usage: python -m benchmarks.bench_playwright_render [--images 60] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+PAGE_HOST = '127.0.0.1'
+TRACKER_HOST = '127.0.0.2'
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def write_fixtures(root, images, tracker_base):
+    """Write a product page that links `images` images plus fonts, CSS, video and tracker scripts."""
+    blob = os.urandom(64 * 1024)
+    for i in range(images):
+        with open(os.path.join(root, f'img{i}.png'), 'wb') as f:
+            f.write(blob)
+    for name in ('font.woff2', 'video.mp4'):
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(os.urandom(512 * 1024))
+    with open(os.path.join(root, 'site.css'), 'w') as f:
+        f.write("@font-face{font-family:f;src:url(font.woff2)}" + ".c{color:red}" * 20000)
+    with open(os.path.join(root, 'tracker.js'), 'w') as f:
+        f.write("var t=[];for(var i=0;i<200000;i++){t.push({i:i,s:'event'+i})}")
+    with open(os.path.join(root, 'price.js'), 'w') as f:
+        f.write("document.addEventListener('DOMContentLoaded',function(){"
+                "var el=document.createElement('span');el.className='price';el.textContent='$349.99';"
+                "document.getElementById('product').appendChild(el)});")
+
+    gallery = ''.join(f'<img src="img{i}.png" width="200">' for i in range(images))
+    with open(os.path.join(root, 'product.html'), 'w') as f:
+        f.write(f"""<html><head><title>Fixture</title><link rel="stylesheet" href="site.css">
+<script src="{tracker_base}/tracker.js"></script><script src="price.js"></script></head>
+<body><h1 class="product-title">Fixture Headphones</h1><div id="product"></div>{gallery}
+<video src="video.mp4" autoplay muted></video></body></html>""")
+
+
+def serve(root, host):
+    server = ThreadingHTTPServer((host, 0), partial(QuietHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def process_tree_rss_kb():
+    """Sum VmRSS over every descendant of this process (the Playwright driver and Chromium)."""
+    parents = {}
+    for pid in filter(str.isdigit, os.listdir('/proc')):
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                parents[int(pid)] = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    tree, frontier = set(), {os.getpid()}
+    while frontier:
+        frontier = {pid for pid, parent in parents.items() if parent in frontier} - tree
+        tree |= frontier
+
+    total = 0
+    for pid in tree:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+        except (OSError, StopIteration):
+            continue
+    return total
+
+
+def render(browser, url, policy):
+    from bs4 import BeautifulSoup
+    from app.services.scraper_service import scraper_service
+
+    page = browser.new_page()
+    requests_made = []
+    page.on('requestfinished', lambda request: requests_made.append(request))
+    counts = policy.install(page, url) if policy else None
+
+    started = time.perf_counter()
+    page.goto(url, wait_until='load', timeout=30000)
+    content = page.content()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    cdp = page.context.new_cdp_session(page)
+    cdp.send('Performance.enable')
+    heap = next(m['value'] for m in cdp.send('Performance.getMetrics')['metrics'] if m['name'] == 'JSHeapUsedSize')
+    rss_kb = process_tree_rss_kb()
+    page.close()
+
+    result = scraper_service._extract_from_soup(BeautifulSoup(content, 'lxml'), url)
+    return {
+        'ms': elapsed_ms,
+        'heap_mb': heap / 2 ** 20,
+        'rss_mb': rss_kb / 1024,
+        'requests': len(requests_made),
+        'blocked': counts['blocked'] if counts else 0,
+        'price': result and result['price'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=int, default=60)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    from playwright.sync_api import sync_playwright
+    from app.services.render_policy import RenderPolicy, TRACKER_DOMAINS
+
+    root = tempfile.mkdtemp()
+    tracker = serve(root, TRACKER_HOST)
+    write_fixtures(root, args.images, f'http://{TRACKER_HOST}:{tracker.server_port}')
+    site = serve(root, PAGE_HOST)
+    url = f'http://{PAGE_HOST}:{site.server_port}/product.html'
+
+    modes = {
+        'full': None,
+        'blocked': RenderPolicy(tracker_domains=TRACKER_DOMAINS + (TRACKER_HOST,)),
+    }
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        results = {name: [render(browser, url, policy) for _ in range(args.runs)] for name, policy in modes.items()}
+        browser.close()
+
+    prices = {run['price'] for runs in results.values() for run in runs}
+    assert len(prices) == 1 and None not in prices, prices
+
+    for name, runs in results.items():
+        median = {key: statistics.median(run[key] for run in runs) for key in ('ms', 'heap_mb', 'rss_mb', 'requests', 'blocked')}
+        print(f"{name:<8} render={median['ms']:8.1f} ms  js_heap={median['heap_mb']:6.1f} MB  "
+              f"rss={median['rss_mb']:7.1f} MB  requests={median['requests']:4.0f}  blocked={median['blocked']:4.0f}")
+    print(f"price={prices.pop()}")
+
+
+if __name__ == '__main__':
+    main()
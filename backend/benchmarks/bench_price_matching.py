@@ -0,0 +1,210 @@
+"""Compare the legacy per-pattern price regexes with the compiled single-scan matcher.
+
+Script blobs mimic what product pages inline: a Next.js-style __NEXT_DATA__ state
+with the price deep in the payload, a minified analytics bundle without any price
+and a storefront config whose only price key is a salePrice near the end.
+
+The hand-picked inputs must match the legacy results exactly. A differential
+fuzz then feeds both implementations random strings built from price-like
+fragments and reports how often, and how, their results differ.
+
+Usage: python -m benchmarks.bench_price_matching [--kb 400] [--repeat 20] [--fuzz 20000]
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from decimal import Decimal
+
+LEGACY_CURRENCY_SYMBOLS = {
+    '$': 'USD', '€': 'EUR', '£': 'GBP', '¥': 'JPY', '₹': 'INR', 'Rs': 'INR',
+    'USD': 'USD', 'EUR': 'EUR', 'GBP': 'GBP', 'INR': 'INR',
+}
+
+
+def legacy_detect_currency(text):
+    for symbol, currency in LEGACY_CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return currency
+    return 'USD'
+
+
+def legacy_text(text):
+    price_patterns = [
+        r'[₹Rs\.]*\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        r'[\$€£¥]\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:USD|EUR|GBP|INR|Rs)',
+        r'Price[:\s]*[₹\$€£¥Rs\.]*\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+    ]
+    for pattern in price_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                price = Decimal(match.group(1).replace(',', ''))
+                if price > 0:
+                    return (price, legacy_detect_currency(text))
+            except Exception:
+                continue
+    return None
+
+
+def legacy_script(text):
+    price_patterns = [
+        r'"price"\s*:\s*"?(\d+\.?\d*)"?',
+        r'"price"\s*:\s*(\d+\.?\d*)',
+        r'price:\s*"?(\d+\.?\d*)"?',
+        r'"currentPrice"\s*:\s*"?(\d+\.?\d*)"?',
+        r'"salePrice"\s*:\s*"?(\d+\.?\d*)"?',
+    ]
+    currency_patterns = [
+        r'"currency"\s*:\s*"([A-Z]{3})"',
+        r'"priceCurrency"\s*:\s*"([A-Z]{3})"',
+    ]
+    for pattern in price_patterns:
+        match = re.search(pattern, text)
+        if match:
+            try:
+                price = Decimal(match.group(1))
+                currency = 'USD'
+                for curr_pattern in currency_patterns:
+                    curr_match = re.search(curr_pattern, text)
+                    if curr_match:
+                        currency = curr_match.group(1)
+                        break
+                if price > 0:
+                    return (price, currency)
+            except Exception:
+                continue
+    return None
+
+
+def filler(rng, size):
+    """Minified-JS-like noise that never contains a price key."""
+    words = ['function', 'return', 'var', 'this', 'props', 'state', 'window', 'document', 'module', 'exports',
+             'dispatch', 'render', 'children', 'className', 'onClick', 'layout', 'sku', 'variant', 'width']
+    out, length = [], 0
+    while length < size:
+        chunk = f'{rng.choice(words)}({rng.randint(0, 9999)},"{rng.choice(words)}"),'
+        out.append(chunk)
+        length += len(chunk)
+    return ''.join(out)
+
+
+def script_blobs(size):
+    rng = random.Random(42)
+    next_data = json.dumps({
+        'props': {'pageProps': {
+            'layout': filler(rng, size * 3 // 4),
+            'product': {'name': 'Noise cancelling headphones', 'sku': 'WH-1000',
+                        'offers': {'currentPrice': '279.99', 'price': 299.99, 'currency': 'EUR'}},
+            'recommendations': filler(rng, size // 4),
+        }},
+        'page': '/p/[slug]',
+    })
+    analytics = f'!function(e,t){{{filler(rng, size)}}}(window,document);'
+    storefront = f'window.__CONFIG__={{{filler(rng, size)}"priceCurrency":"GBP","salePrice":"49.50"}};'
+    return {'next_data': next_data, 'analytics': analytics, 'storefront': storefront}
+
+
+TEXT_SAMPLES = [
+    '$1,299.99',
+    'Price: ₹ 54,990.00 inclusive of all taxes',
+    'Was 0.00 now €79.95 EUR',
+    'Rs. 499 Only',
+    'Save 20% — £149.00 with free delivery over 50 GBP',
+    'Out of stock',
+]
+
+
+# Inputs whose results knowingly differ from the legacy chain, which gave up on
+# a pattern whose first match was zero and moved on to the next pattern
+KNOWN_DIFFERENCES = [
+    (legacy_text, 'match_text', '0 Rs 1,499'),
+    (legacy_text, 'match_text', '.0000Price₹4.5GBP1'),
+    (legacy_script, 'match_script', '"price": 0, "price": 5'),
+]
+
+TEXT_FRAGMENTS = ['0', '00', '1', '4', '5', '12', '499', '1,499', '1,299.99', '.', '.5', '.00', ',', ' ', ': ',
+                  '$', '€', '£', '¥', '₹', 'Rs', 'Rs.', 'USD', 'EUR', 'GBP', 'INR', 'Price', 'was', '-', 'x']
+SCRIPT_FRAGMENTS = ['"price"', 'price', '"currentPrice"', '"salePrice"', '"priceCurrency"', '"currency"',
+                    ':', ' ', '"', ',', '{', '}', '0', '0.0', '12', '4.5', '19.99', '.', '"EUR"', '"GBP"', 'x']
+
+
+def fuzz_inputs(fragments, count, seed):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(fragments) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def differences(legacy_fn, matched_fn, samples):
+    """Count the inputs whose results differ, by kind, keeping one example of each kind."""
+    counts, examples = {}, {}
+    for sample in samples:
+        legacy, matched = legacy_fn(sample), matched_fn(sample)
+        if legacy == matched:
+            continue
+        if legacy is None:
+            kind = 'legacy none'
+        elif matched is None:
+            kind = 'compiled none'
+        elif legacy[0] != matched[0]:
+            kind = 'price'
+        else:
+            kind = 'currency'
+        counts[kind] = counts.get(kind, 0) + 1
+        examples.setdefault(kind, (sample, legacy, matched))
+    return counts, examples
+
+
+def timed(fn, samples, repeat):
+    results, timings = None, []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [fn(sample) for sample in samples]
+        timings.append((time.perf_counter() - started) * 1000)
+    return results, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--kb', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--fuzz', type=int, default=20000)
+    args = parser.parse_args()
+
+    from app.services.price_matcher import price_matcher
+
+    for name, blob in script_blobs(args.kb * 1024).items():
+        legacy, legacy_ms = timed(legacy_script, [blob], args.repeat)
+        matched, matched_ms = timed(price_matcher.match_script, [blob], args.repeat)
+        assert legacy == matched, (name, legacy, matched)
+        print(f"script {name:<10} {len(blob) // 1024:>5} KB  legacy={legacy_ms:8.2f} ms  "
+              f"compiled={matched_ms:8.2f} ms  speedup={legacy_ms / matched_ms:5.1f}x  -> {matched[0]}")
+
+    samples = TEXT_SAMPLES * 500
+    legacy, legacy_ms = timed(legacy_text, samples, args.repeat)
+    matched, matched_ms = timed(price_matcher.match_text, samples, args.repeat)
+    assert legacy == matched, [(s, a, b) for s, a, b in zip(samples, legacy, matched) if a != b][:3]
+    print(f"text   {len(samples)} snippets      legacy={legacy_ms:8.2f} ms  "
+          f"compiled={matched_ms:8.2f} ms  speedup={legacy_ms / matched_ms:5.1f}x")
+
+    for legacy_fn, method, sample in KNOWN_DIFFERENCES:
+        print(f"known  {method:<12} {sample!r:<28} legacy={legacy_fn(sample)}  "
+              f"compiled={getattr(price_matcher, method)(sample)}")
+
+    for name, legacy_fn, matched_fn, fragments in (
+        ('text', legacy_text, price_matcher.match_text, TEXT_FRAGMENTS),
+        ('script', legacy_script, price_matcher.match_script, SCRIPT_FRAGMENTS),
+    ):
+        samples = fuzz_inputs(fragments, args.fuzz, seed=7)
+        counts, examples = differences(legacy_fn, matched_fn, samples)
+        print(f"fuzz   {name:<6} {len(samples)} inputs  differ={sum(counts.values())}  "
+              + '  '.join(f"{kind}={count}" for kind, count in sorted(counts.items())))
+        for kind, (sample, legacy, matched) in sorted(examples.items()):
+            print(f"       {kind:<13} {sample!r:<40} legacy={legacy}  compiled={matched}")
+
+
+if __name__ == '__main__':
+    main()
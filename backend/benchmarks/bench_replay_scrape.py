@@ -0,0 +1,119 @@
+"""Replay an archived page corpus through the scraper: throughput plus extraction regressions.
+
+Record a corpus with SCRAPER_ARCHIVE_MODE=record, or pass --synthetic N to build a
+throwaway archive of generated pages covering each extraction path. With
+--baseline the extracted fields are compared to a saved run and the script
+exits non-zero on any difference; --update-baseline rewrites it instead.
+
+Usage: python -m benchmarks.bench_replay_scrape [--archive archive/pages | --synthetic 200]
+                                               [--concurrency 8] [--repeat 3]
+                                               [--baseline results.json [--update-baseline]]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+FILLER = '<div class="row"><a href="/c/{i}">Related item {i}</a><p>' + 'lorem ipsum dolor ' * 40 + '</p></div>'
+
+
+def synthetic_page(i):
+    price = f"{(i * 37) % 900 + 9}.99"
+    head_meta = f'<meta property="og:title" content="Meta item {i}"><meta property="og:image" content="https://img.example/{i}.jpg">'
+    body = ''.join(FILLER.format(i=j) for j in range(200))
+    shapes = [
+        f'<head>{head_meta}<meta property="og:price:amount" content="{price}">'
+        f'<meta property="og:price:currency" content="EUR"></head><body>{body}</body>',
+        f'<head>{head_meta}<script type="application/ld+json">'
+        f'{{"@type":"Product","offers":{{"price":"{price}","priceCurrency":"GBP"}}}}</script></head><body>{body}</body>',
+        f'<head><title>Script item {i}</title></head><body>{body}<script>window.__STATE__='
+        f'{{"sku":"{i}","currentPrice":"{price}","currency":"INR"}}</script></body>',
+        f'<head><title>Selector item {i}</title></head><body><h1>Selector item {i}</h1>{body}'
+        f'<span class="price-current">${price}</span></body>',
+    ]
+    return f'<html>{shapes[i % len(shapes)]}</html>'.encode()
+
+
+def build_synthetic(archive, count):
+    for i in range(count):
+        archive.record(f'https://shop{i % 7}.example/product/{i}', 200,
+                       {'Content-Type': 'text/html; charset=utf-8'}, synthetic_page(i))
+
+
+def scrape(scraper, url):
+    started = time.perf_counter()
+    try:
+        data = scraper.scrape_product(url)
+        result = {key: str(value) if value is not None else None for key, value in data.items()}
+    except Exception as e:
+        result = {'error': str(e)}
+    return url, result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--archive')
+    parser.add_argument('--synthetic', type=int, default=0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.services.page_archive import PageArchive
+    from app.services.scraper_service import ScraperService
+
+    archive = PageArchive(args.archive or (tempfile.mkdtemp() if args.synthetic else settings.SCRAPER_ARCHIVE_DIR))
+    if args.synthetic:
+        build_synthetic(archive, args.synthetic)
+
+    urls = [entry['url'] for entry in archive.entries()]
+    if not urls:
+        sys.exit(f"No archived pages in {archive.base_dir}")
+
+    scraper = ScraperService()
+    scraper.use_archive('replay', archive)
+
+    rates, latencies, results = [], [], {}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            runs = list(pool.map(lambda url: scrape(scraper, url), urls))
+            rates.append(len(urls) / (time.perf_counter() - started))
+            latencies.extend(ms for _, _, ms in runs)
+            results = {url: result for url, result, _ in runs}
+
+    failed = sum(1 for result in results.values() if 'error' in result)
+    latencies.sort()
+    print(f"pages={len(urls)} concurrency={args.concurrency} failed={failed}")
+    print(f"throughput median={statistics.median(rates):8.1f} pages/s  "
+          f"latency p50={latencies[len(latencies) // 2]:7.2f} ms  p95={latencies[int(len(latencies) * 0.95)]:7.2f} ms")
+
+    if not args.baseline:
+        return
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    changed = {url: (baseline.get(url), result) for url, result in results.items() if baseline.get(url) != result}
+    for url, (before, after) in sorted(changed.items()):
+        print(f"CHANGED {url}\n  before: {before}\n  after:  {after}")
+    print(f"{len(changed)} of {len(results)} pages differ from {args.baseline}")
+    sys.exit(1 if changed else 0)
+
+
+if __name__ == '__main__':
+    main()
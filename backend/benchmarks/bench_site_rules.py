@@ -0,0 +1,102 @@
+"""Compare rule-based and generic heuristic extraction over the synthetic fixture corpus.
+
+Each fixture shop uses one page template (meta tags, JSON-LD, inline state
+script, price element), and a rule file covering the four shops is written
+to a temporary rules directory. Both paths must extract the same fields.
+
+Usage: python -m benchmarks.bench_site_rules [--pages 400] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+META_NAME = {"css": "meta[property='og:title']", "attr": "content"}
+META_IMAGE = {"css": "meta[property='og:image']", "attr": "content"}
+
+FIXTURE_RULES = [
+    {
+        "domains": ["shop0.example"],
+        "price": [{"css": "meta[property='og:price:amount']", "attr": "content"}],
+        "currency": [{"css": "meta[property='og:price:currency']", "attr": "content"}],
+        "name": [META_NAME],
+        "image": [META_IMAGE],
+    },
+    {
+        "domains": ["shop1.example"],
+        "price": [{"json": "offers.price"}],
+        "currency": [{"json": "offers.priceCurrency"}],
+        "name": [META_NAME],
+        "image": [META_IMAGE],
+    },
+    {
+        "domains": ["shop2.example"],
+        "price": [{"xpath": "//script[contains(., '__STATE__')]", "json": "currentPrice"}],
+        "currency": [{"xpath": "//script[contains(., '__STATE__')]", "json": "currency"}],
+        "name": [{"css": "title"}],
+    },
+    {
+        "domains": ["shop3.example"],
+        "price": [{"css": "span.price-current"}],
+        "name": [{"css": "h1"}],
+    },
+]
+
+
+def timed(fn, pages, repeat):
+    samples, results = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [fn(url, body) for url, body in pages]
+        samples.append((time.perf_counter() - started) * 1000)
+    return results, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from bs4 import BeautifulSoup
+    from app.services.scraper_service import scraper_service
+    from app.services.site_rules import SiteRulesRegistry
+    from benchmarks.bench_replay_scrape import synthetic_page
+
+    rules_dir = tempfile.mkdtemp()
+    with open(os.path.join(rules_dir, 'fixtures.json'), 'w') as f:
+        json.dump(FIXTURE_RULES, f)
+    started = time.perf_counter()
+    registry = SiteRulesRegistry(rules_dir)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    # synthetic_page picks its template from i % 4, so shop{i % 4} always serves the same one
+    pages = [(f'https://shop{i % 4}.example/product/{i}', synthetic_page(i)) for i in range(args.pages)]
+
+    heuristic, heuristic_ms = timed(
+        lambda url, body: scraper_service._extract_from_soup(BeautifulSoup(body, 'lxml'), url), pages, args.repeat
+    )
+    rules, rules_ms = timed(
+        lambda url, body: registry.lookup(url.split('/')[2]).extract(body, url), pages, args.repeat
+    )
+
+    mismatches = [(url, a, b) for (url, _), a, b in zip(pages, heuristic, rules) if a != b]
+    for url, a, b in mismatches[:5]:
+        print(f"MISMATCH {url}\n  heuristic: {a}\n  rules:     {b}")
+    assert not mismatches, f"{len(mismatches)} pages differ"
+
+    size_kb = sum(len(body) for _, body in pages) / len(pages) / 1024
+    print(f"pages={len(pages)} avg_size={size_kb:.0f} KB rules_load={load_ms:.1f} ms")
+    print(f"heuristic  median={heuristic_ms:8.1f} ms  per_page={heuristic_ms / len(pages):6.2f} ms")
+    print(f"rules      median={rules_ms:8.1f} ms  per_page={rules_ms / len(pages):6.2f} ms  "
+          f"speedup={heuristic_ms / rules_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Measure import time and time-to-first-request for app.main in fresh interpreters.
+
+Exits non-zero when the median exceeds the given budgets or when modules that
+should load lazily are imported at startup, so it can guard CI against
+regressions.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--max-import-ms 1500] [--max-first-request-ms 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+LAZY_MODULES = ['bs4', 'lxml', 'numpy', 'pyarrow', 'authlib', 'playwright', 'requests']
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+eager = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+from fastapi.testclient import TestClient
+response = TestClient(app.main.app).get("/health")
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (finished - started) * 1000,
+    "status": response.status_code,
+    "eager_modules": eager,
+}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=1500)
+    parser.add_argument('--max-first-request-ms', type=float, default=2000)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db"),
+        "REDIS_URL": os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+        "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY", "benchmark-secret"),
+    }
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=backend_dir, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(result["import_ms"] for result in results)
+    first_request_ms = statistics.median(result["first_request_ms"] for result in results)
+    eager = sorted({name for result in results for name in result["eager_modules"]})
+
+    print(f"runs={args.runs} import_ms={import_ms:.0f} first_request_ms={first_request_ms:.0f} "
+          f"eager_modules={','.join(eager) or '-'}")
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f"import {import_ms:.0f} ms exceeds {args.max_import_ms:.0f} ms")
+    if first_request_ms > args.max_first_request_ms:
+        failures.append(f"first request {first_request_ms:.0f} ms exceeds {args.max_first_request_ms:.0f} ms")
+    if eager:
+        failures.append(f"modules imported at startup: {', '.join(eager)}")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Seed a realistic dataset, run the hot routes and task queries, and EXPLAIN every statement they issue.
+
+Statements are captured from the engine while real requests go through the
+app and the price check task runs against an empty page archive, so the
+plans checked are those of the SQL the code actually sends. Exits non-zero
+when any statement reads a table without an index, which keeps plan
+regressions out of new queries and index changes.
+
+Works against SQLite (EXPLAIN QUERY PLAN) and MySQL (EXPLAIN). Point
+DATABASE_URL at a scratch database: the schema is created if missing and
+the run refuses to seed a database that already has users.
+
+Usage: python -m benchmarks.explain_queries [--users 200] [--items 2000] [--products-per-user 25]
+                                            [--points 30] [--verbose]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+os.environ.setdefault("EVENTS_ENABLED", "false")
+# Every scrape misses the empty archive, so the task runs its queries without network access
+os.environ.setdefault("SCRAPER_ARCHIVE_MODE", "replay")
+os.environ.setdefault("SCRAPER_ARCHIVE_DIR", tempfile.mkdtemp())
+
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def seed(db, args):
+    from sqlalchemy import insert
+    from app.models import User, CatalogItem, Product, PriceAlert, PriceHistory
+    from app.services.catalog_service import url_hash
+    from app.services.sparkline import pack_points
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    db.execute(insert(User), [
+        {'id': u, 'google_id': f'explain-{u}', 'email': f'explain-{u}@example.com', 'name': f'User {u}'}
+        for u in range(1, args.users + 1)
+    ])
+
+    items = []
+    for i in range(1, args.items + 1):
+        url = f'https://shop{i % 50}.example/product/{i}'
+        price = Decimal(rng.randint(500, 50000)) / 100
+        items.append({
+            'id': i, 'url': url, 'url_hash': url_hash(url), 'name': f'Item {i}', 'current_price': price,
+            'currency': 'USD', 'last_checked_at': now - timedelta(minutes=rng.randint(0, 240)),
+            'recent_prices': pack_points([(now, price)]),
+        })
+    db.execute(insert(CatalogItem), items)
+
+    # Popular items are tracked by many users, the long tail by few
+    products, alerts = [], []
+    for u in range(1, args.users + 1):
+        tracked = set()
+        while len(tracked) < min(args.products_per_user, args.items):
+            tracked.add(min(int(rng.paretovariate(1.2)), args.items))
+        for item_id in tracked:
+            products.append({
+                'id': len(products) + 1, 'user_id': u, 'catalog_item_id': item_id,
+                'is_active': rng.random() > 0.1, 'check_interval_minutes': rng.choice([15, 60, 360, 1440]),
+            })
+            for _ in range(rng.randint(0, 3)):
+                triggered = rng.random() < 0.2
+                alerts.append({
+                    'product_id': len(products), 'alert_type': 'target_price',
+                    'target_price': items[item_id - 1]['current_price'] * Decimal('0.9'),
+                    'is_active': rng.random() > 0.1, 'triggered_at': now if triggered else None,
+                })
+    db.execute(insert(Product), products)
+    db.execute(insert(PriceAlert), alerts)
+
+    for start in range(0, len(items), 500):
+        db.execute(insert(PriceHistory), [
+            {'catalog_item_id': item['id'], 'price': item['current_price'] + Decimal(rng.randint(-500, 500)) / 100,
+             'recorded_at': now - timedelta(days=p)}
+            for item in items[start:start + 500] for p in range(args.points)
+        ])
+    db.commit()
+    return len(products), len(alerts)
+
+
+def analyze(db):
+    from app.database import Base
+
+    if db.bind.dialect.name == 'sqlite':
+        db.connection().exec_driver_sql("ANALYZE")
+    else:
+        for table in Base.metadata.sorted_tables:
+            db.connection().exec_driver_sql(f"ANALYZE TABLE {table.name}")
+    db.commit()
+
+
+def full_scans(connection, statement, parameters):
+    """Tables the plan reads in full, ignoring derived tables and subquery results."""
+    from app.database import Base
+
+    tables = set(Base.metadata.tables)
+    scans = []
+    if connection.dialect.name == 'sqlite':
+        for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+            match = SQLITE_SCAN.match(row[-1])
+            if match and re.sub(r'_\d+$', '', match.group(1)) in tables:
+                scans.append(match.group(1))
+    else:
+        for row in connection.exec_driver_sql("EXPLAIN " + statement, parameters).mappings():
+            if row['type'] == 'ALL' and row['table'] and not row['table'].startswith('<'):
+                scans.append(row['table'])
+    return scans
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--products-per-user', type=int, default=25)
+    parser.add_argument('--points', type=int, default=30)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    from sqlalchemy import event, func
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import Base, SessionLocal, engine
+    from app.models import User, Product, PriceAlert
+    from app.services.auth_service import create_access_token
+    from app.services.alert_service import alert_service
+    from app.tasks.price_checker import check_prices
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    if db.query(func.count(User.id)).scalar():
+        sys.exit("Refusing to seed a database that already has users; point DATABASE_URL at a scratch database")
+    product_count, alert_count = seed(db, args)
+    analyze(db)
+    print(f"seeded users={args.users} items={args.items} products={product_count} alerts={alert_count} "
+          f"history={args.items * args.points} on {engine.dialect.name}")
+
+    # The heaviest user, and one of their products with alerts, drive the route requests
+    user_id, = db.query(Product.user_id).group_by(Product.user_id).order_by(func.count().desc()).first()
+    product_id, item_id = db.query(Product.id, Product.catalog_item_id).join(PriceAlert).filter(
+        Product.user_id == user_id
+    ).first()
+    alert_ids = [alert_id for alert_id, in db.query(PriceAlert.id).filter(PriceAlert.product_id == product_id)]
+    db.close()
+
+    captured = {}
+    scenario = ['']
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH'):
+            captured.setdefault(statement, (scenario[0], parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'user_id': user_id})}"}
+    requests = [
+        ('GET', "/products"),
+        ('GET', f"/products/{product_id}"),
+        ('GET', f"/products/{product_id}/alerts"),
+        ('PATCH', f"/alerts/{alert_ids[0]}"),
+        ('DELETE', f"/alerts/{alert_ids[-1]}"),
+        ('GET', f"/products/{product_id}/history"),
+        ('GET', f"/products/{product_id}/history/export?format=csv"),
+        ('GET', "/history/export?format=csv"),
+        ('GET', "/dashboard/summary"),
+        ('GET', "/products/stats"),
+        ('GET', f"/products/{product_id}/stats"),
+    ]
+    for method, path in requests:
+        scenario[0] = f"{method} {path}"
+        kwargs = {'json': {'is_active': True}} if method == 'PATCH' else {}
+        response = client.request(method, path, headers=headers, **kwargs)
+        if response.status_code >= 400:
+            print(f"warning: {scenario[0]} returned {response.status_code}")
+
+    scenario[0] = "check_prices"
+    try:
+        check_prices.apply()
+    except Exception as e:
+        print(f"warning: check_prices failed ({str(e).splitlines()[0]}); its statements are still explained")
+
+    scenario[0] = "alert checks"
+    db = SessionLocal()
+    price = Decimal('1.00')
+    alert_service.pending_triggered(db, item_id, price)
+    alert_service.relevel_after_check(db, item_id, price)
+    db.rollback()
+    db.close()
+    event.remove(engine, "before_cursor_execute", capture)
+
+    failures = 0
+    with engine.connect() as connection:
+        for statement, (name, parameters) in captured.items():
+            summary = ' '.join(statement.split())[:110]
+            try:
+                scans = full_scans(connection, statement, parameters)
+            except Exception as e:
+                print(f"SKIP  {name:<45} {summary}\n      {str(e).splitlines()[0]}")
+                connection.rollback()
+                continue
+            if scans:
+                failures += 1
+                print(f"FAIL  {name:<45} full scan of {', '.join(scans)}\n      {summary}")
+            elif args.verbose:
+                print(f"ok    {name:<45} {summary}")
+
+    print(f"statements={len(captured)} full_scans={failures}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
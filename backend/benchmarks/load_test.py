@@ -0,0 +1,253 @@
+"""Drive concurrent load at the API and report throughput, latency and SQL per request.
+
+Boots app.main under uvicorn in-process against SQLite (default) or any
+DATABASE_URL such as a local MySQL, seeds synthetic users, products, alerts
+and history, mints JWTs with create_access_token and then runs one load phase
+per endpoint. Results are printed as a table and written as JSON so releases
+can be compared.
+
+Usage:
+    python -m benchmarks.load_test --users 20 --products-per-user 25 \\
+        --history-points 200 --concurrency 32 --requests 2000 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ENDPOINTS = {
+    'list_products': lambda ctx: "/products",
+    'get_product': lambda ctx: f"/products/{random.choice(ctx['product_ids'])}",
+    'list_alerts': lambda ctx: f"/products/{random.choice(ctx['product_ids'])}/alerts",
+    'price_history': lambda ctx: f"/products/{random.choice(ctx['product_ids'])}/history?limit=100",
+    'dashboard_summary': lambda ctx: "/dashboard/summary",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--products-per-user', type=int, default=20)
+    parser.add_argument('--history-points', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000, help='requests per endpoint phase')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--with-cache', action='store_true', help='leave the Redis response cache enabled')
+    parser.add_argument('--output', default=None)
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    os.environ["DATABASE_URL"] = args.database_url or os.environ.get(
+        "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/load.db"
+    )
+    os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test-secret")
+    os.environ["EVENTS_ENABLED"] = "false"
+    if not args.with_cache:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+
+def seed(args):
+    from decimal import Decimal
+    from sqlalchemy import insert, select
+    from app.database import Base, SessionLocal, engine
+    from app.models import User, CatalogItem, Product, PriceAlert, PriceHistory
+    from app.services.catalog_service import url_hash
+    from app.services.auth_service import create_access_token
+    from app.services.sparkline import pack_points
+
+    Base.metadata.create_all(bind=engine)
+    run_id = int(time.time())
+    start = datetime.utcnow() - timedelta(hours=args.history_points)
+    db = SessionLocal()
+    tokens = []
+    product_ids = {}
+    for u in range(args.users):
+        user = User(google_id=f"load-{run_id}-{u}", email=f"load-{run_id}-{u}@example.com", name=f"Load {u}")
+        db.add(user)
+        db.flush()
+        tokens.append((user.id, create_access_token(data={"user_id": user.id, "email": user.email})))
+
+        urls = [f"https://shop.example.com/{run_id}/{u}/{p}" for p in range(args.products_per_user)]
+        db.execute(insert(CatalogItem), [
+            {
+                'url': url,
+                'url_hash': url_hash(url),
+                'name': f"Synthetic item {u}-{p}",
+                'current_price': Decimal('99.99'),
+                'currency': 'USD',
+                'created_at': start,
+                'updated_at': start,
+                'recent_prices': pack_points([(start, Decimal('99.99'))]),
+            }
+            for p, url in enumerate(urls)
+        ])
+        item_ids = list(db.execute(
+            select(CatalogItem.id).where(CatalogItem.url_hash.in_([url_hash(url) for url in urls]))
+        ).scalars())
+
+        db.execute(insert(Product), [
+            {
+                'user_id': user.id,
+                'catalog_item_id': item_id,
+                'is_active': True,
+                'check_interval_minutes': 60,
+                'created_at': start,
+                'updated_at': start,
+            }
+            for item_id in item_ids
+        ])
+        ids = list(db.execute(select(Product.id).where(Product.user_id == user.id)).scalars())
+        product_ids[user.id] = ids
+
+        db.execute(insert(PriceAlert), [
+            {'product_id': product_id, 'target_price': Decimal('50.00'), 'is_active': True, 'created_at': start}
+            for product_id in ids
+        ])
+        db.execute(insert(PriceHistory), [
+            {
+                'catalog_item_id': item_id,
+                'price': Decimal('120.00') - (i % 40),
+                'recorded_at': start + timedelta(hours=i),
+            }
+            for item_id in item_ids
+            for i in range(args.history_points)
+        ])
+        db.commit()
+    db.close()
+    return tokens, product_ids
+
+
+def start_server():
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+
+async def run_phase(base_url, name, build_path, tokens, product_ids, args):
+    import httpx
+
+    latencies = []
+    errors = 0
+    remaining = args.requests
+    lock = asyncio.Lock()
+
+    async def worker(client):
+        nonlocal remaining, errors
+        while True:
+            async with lock:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            user_id, token = random.choice(tokens)
+            path = build_path({'product_ids': product_ids[user_id]})
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 2),
+            'p50': round(quantiles[49], 2),
+            'p90': round(quantiles[89], 2),
+            'p99': round(quantiles[98], 2),
+            'max': round(latencies[-1], 2),
+        },
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+
+    from app.database import engine
+
+    tokens, product_ids = seed(args)
+    server, thread, base_url = start_server()
+    counter = QueryCounter(engine)
+
+    results = {}
+    try:
+        for name in args.endpoints.split(','):
+            before = counter.count
+            results[name] = asyncio.run(run_phase(base_url, name, ENDPOINTS[name], tokens, product_ids, args))
+            results[name]['queries_per_request'] = round((counter.count - before) / results[name]['requests'], 2)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    print(f"{'endpoint':<20} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'q/req':>6} {'errors':>6}")
+    for name, result in results.items():
+        latency = result['latency_ms']
+        print(f"{name:<20} {result['throughput_rps']:>8} {latency['p50']:>8} {latency['p90']:>8} "
+              f"{latency['p99']:>8} {result['queries_per_request']:>6} {result['errors']:>6}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat(),
+                'git_revision': git_revision(),
+                'database': engine.url.get_backend_name(),
+                'parameters': {key: value for key, value in vars(args).items() if key != 'output'},
+            },
+            'endpoints': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()